@@ -5,24 +5,157 @@ to the concrete caveat list that CaveatBuilder would produce:
   - AllowedTargets  -> [USDC, SwapRouter02]
   - AllowedMethods  -> [approve(address,uint256), exactInputSingle((...))]
   - ERC20TransferAmount -> cap on USDC spend
+
+Selectors are hashed with pysha3 when it is installed and with pycryptodome
+(already required by web3) otherwise, skipping the ``Web3.keccak`` wrapper.
+The module-level selector constants are computed on first access, so
+importing this module for ``print_caveats`` alone pays no keccak at all.
+Downstream code that still hashes through web3 can opt into the same fast
+backend with ``ETH_HASH_BACKEND=pysha3``.
 """
 
 from __future__ import annotations
 
-from web3 import Web3
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+from .constants import PAIRS, SWAP_ROUTER_02, SwapPair
+
+try:
+    import sha3
+
+    def _keccak256(data: bytes) -> bytes:
+        return sha3.keccak_256(data).digest()
+
+except ImportError:
+    from Crypto.Hash import keccak as _keccak
+
+    def _keccak256(data: bytes) -> bytes:
+        return _keccak.new(digest_bits=256, data=data).digest()
+
+
+def _selector(sig: str) -> str:
+    """Return the 0x-prefixed 4-byte function selector for *sig*."""
+    return "0x" + _keccak256(sig.encode()).hex()[:8]
+
+
+@lru_cache(maxsize=256)
+def selector_for(sig: str) -> str:
+    """Return the 0x-prefixed selector for *sig*, memoized.
+
+    Use this instead of hashing signatures with ``Web3.keccak`` at every
+    call site.
+    """
+    return _selector(sig)
+
+
+# Canonical function signatures
+APPROVE_SIG = "approve(address,uint256)"
+TRANSFER_SIG = "transfer(address,uint256)"
+EXACT_INPUT_SINGLE_SIG = (
+    "exactInputSingle((address,address,uint24,address,uint256,uint256,uint160))"
+)
+_KNOWN_SIGS = (APPROVE_SIG, TRANSFER_SIG, EXACT_INPUT_SINGLE_SIG)
+
+# Function selectors (first 4 bytes of keccak). SELECTORS, APPROVE_SELECTOR
+# and EXACT_INPUT_SINGLE_SELECTOR are resolved lazily by __getattr__ below;
+# code inside this module calls selector_for() instead.
+_SELECTOR_CONSTANTS = {
+    "APPROVE_SELECTOR": APPROVE_SIG,
+    "EXACT_INPUT_SINGLE_SELECTOR": EXACT_INPUT_SINGLE_SIG,
+}
+
+
+def __getattr__(name: str):
+    # PEP 562: hash on first access, then cache in the module globals so
+    # later lookups never reach this function again.
+    if name == "SELECTORS":
+        value = MappingProxyType({sig: selector_for(sig) for sig in _KNOWN_SIGS})
+    elif name in _SELECTOR_CONSTANTS:
+        value = selector_for(_SELECTOR_CONSTANTS[name])
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Caveats:
+    """Typed, immutable form of a caveat resolution map.
+
+    Each caveat field is a slot attribute rather than a nested dict entry,
+    so consumers that read it repeatedly skip the dict hashing. Use
+    ``Caveats.from_map()`` / ``to_dict()`` to convert to and from the dict
+    returned by ``usdc_weth_swap_caveats()`` and ``swap_caveats()``.
+
+    Attributes
+    ----------
+    targets : tuple[str, ...]
+        AllowedTargets addresses.
+    methods : tuple[str, ...]
+        AllowedMethods 4-byte selectors.
+    token : str
+        ERC20TransferAmount token address.
+    cap : int
+        ERC20TransferAmount cap in raw token units.
+    token_in, token_out : str
+        SwapConstraints input and output token addresses.
+    fee : int
+        SwapConstraints pool fee tier.
+    recipient : str
+        SwapConstraints output recipient.
+    """
+
+    targets: tuple[str, ...]
+    methods: tuple[str, ...]
+    token: str
+    cap: int
+    token_in: str
+    token_out: str
+    fee: int
+    recipient: str
 
-from .constants import USDC, WETH, SWAP_ROUTER_02, POOL_FEE, SwapPair
+    @classmethod
+    def from_map(cls, caveats: dict) -> Caveats:
+        """Build a Caveats from a caveat resolution map dict."""
+        cap = caveats["ERC20TransferAmount"]
+        sc = caveats["SwapConstraints"]
+        return cls(
+            targets=tuple(caveats["AllowedTargets"]),
+            methods=tuple(caveats["AllowedMethods"]),
+            token=cap["token"],
+            cap=int(cap["maxAmount"]),
+            token_in=sc["tokenIn"],
+            token_out=sc["tokenOut"],
+            fee=int(sc["fee"]),
+            recipient=sc["recipient"],
+        )
 
-# Function selectors (first 4 bytes of keccak)
-APPROVE_SELECTOR = Web3.keccak(text="approve(address,uint256)")[:4].hex()
-EXACT_INPUT_SINGLE_SELECTOR = Web3.keccak(
-    text="exactInputSingle((address,address,uint24,address,uint256,uint256,uint160))"
-)[:4].hex()
+    def to_dict(self) -> dict:
+        """Return the equivalent caveat resolution map dict."""
+        return {
+            "AllowedTargets": list(self.targets),
+            "AllowedMethods": list(self.methods),
+            "ERC20TransferAmount": {
+                "token": self.token,
+                "maxAmount": self.cap,
+            },
+            "SwapConstraints": {
+                "tokenIn": self.token_in,
+                "tokenOut": self.token_out,
+                "fee": self.fee,
+                "recipient": self.recipient,
+            },
+        }
 
 
 def usdc_weth_swap_caveats(max_usdc: int, recipient: str) -> dict:
     """Return the caveat map for a delegated USDC->WETH swap.
 
+    Shorthand for ``swap_caveats(PAIRS["USDC/WETH"], max_usdc, recipient)``.
+
     Parameters
     ----------
     max_usdc : int
@@ -34,18 +167,27 @@ def usdc_weth_swap_caveats(max_usdc: int, recipient: str) -> dict:
     -------
     dict with keys matching MetaMask DelegationFramework caveat types.
     """
+    return swap_caveats(PAIRS["USDC/WETH"], max_usdc, recipient)
+
+
+@lru_cache(maxsize=None)
+def _swap_template(pair: SwapPair) -> dict:
+    """Caveat map for *pair* with placeholder cap and recipient, built once."""
     return {
-        "AllowedTargets": [USDC, SWAP_ROUTER_02],
-        "AllowedMethods": [APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR],
+        "AllowedTargets": [pair.token_in.address, SWAP_ROUTER_02],
+        "AllowedMethods": [
+            selector_for(APPROVE_SIG),
+            selector_for(EXACT_INPUT_SINGLE_SIG),
+        ],
         "ERC20TransferAmount": {
-            "token": USDC,
-            "maxAmount": max_usdc,
+            "token": pair.token_in.address,
+            "maxAmount": 0,
         },
         "SwapConstraints": {
-            "tokenIn": USDC,
-            "tokenOut": WETH,
-            "fee": POOL_FEE,
-            "recipient": recipient,
+            "tokenIn": pair.token_in.address,
+            "tokenOut": pair.token_out.address,
+            "fee": pair.fee,
+            "recipient": "",
         },
     }
 
@@ -66,33 +208,27 @@ def swap_caveats(pair: SwapPair, max_amount_in: int, recipient: str) -> dict:
     -------
     dict with keys matching MetaMask DelegationFramework caveat types.
     """
-    return {
-        "AllowedTargets": [pair.token_in.address, SWAP_ROUTER_02],
-        "AllowedMethods": [APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR],
-        "ERC20TransferAmount": {
-            "token": pair.token_in.address,
-            "maxAmount": max_amount_in,
-        },
-        "SwapConstraints": {
-            "tokenIn": pair.token_in.address,
-            "tokenOut": pair.token_out.address,
-            "fee": pair.fee,
-            "recipient": recipient,
-        },
-    }
+    # Copy each entry of the cached template so callers can mutate the
+    # result freely, then patch in the per-call values.
+    caveats = {k: v.copy() for k, v in _swap_template(pair).items()}
+    caveats["ERC20TransferAmount"]["maxAmount"] = max_amount_in
+    caveats["SwapConstraints"]["recipient"] = recipient
+    return caveats
 
 
-def print_caveats(caveats: dict) -> None:
+def print_caveats(caveats: dict | Caveats) -> None:
     """Pretty-print a caveat resolution map."""
-    print("\n--- Caveat Resolution Map ---")
+    if isinstance(caveats, Caveats):
+        caveats = caveats.to_dict()
+    # Build the whole block first and emit it with a single write.
+    lines = ["", "--- Caveat Resolution Map ---"]
     for caveat_type, value in caveats.items():
         if isinstance(value, list):
             items = ", ".join(str(v) for v in value)
-            print(f"  {caveat_type}: [{items}]")
+            lines.append(f"  {caveat_type}: [{items}]")
         elif isinstance(value, dict):
-            print(f"  {caveat_type}:")
-            for k, v in value.items():
-                print(f"    {k}: {v}")
+            lines.append(f"  {caveat_type}:")
+            lines.extend(f"    {k}: {v}" for k, v in value.items())
         else:
-            print(f"  {caveat_type}: {value}")
-    print()
+            lines.append(f"  {caveat_type}: {value}")
+    sys.stdout.write("\n".join(lines) + "\n\n")
@@ -1,6 +1,8 @@
 """Mainnet contract addresses, ABIs, and storage slots."""
 
+import sys
 from dataclasses import dataclass
+from types import MappingProxyType
 
 
 # --- Token addresses ---
@@ -21,13 +23,15 @@ CHAINLINK_ETH_USD = "0x5f4eC3Df9cbd43714FE2740f5E3616155c5b8419"
 # --- Storage slots ---
 USDC_BALANCE_SLOT = 9
 WETH_BALANCE_SLOT = 3
+USDC_ALLOWANCE_SLOT = 10  # FiatTokenV2 allowed[owner][spender]
+WETH_ALLOWANCE_SLOT = 4   # WETH9 allowance[owner][spender]
 
 
 # ---------------------------------------------------------------------------
 # Token & pair registry
 # ---------------------------------------------------------------------------
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Token:
     """An ERC-20 token with metadata needed for Anvil simulation.
 
@@ -50,7 +54,7 @@ class Token:
     balance_slot: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SwapPair:
     """A Uniswap V3 swap pair with pool metadata.
 
@@ -71,23 +75,34 @@ class SwapPair:
     pool_address: str
     fee: int
 
+    def __post_init__(self) -> None:
+        # Uniswap V3 encodes the fee as uint24; reject anything that could
+        # never match an on-chain pool (or an exactInputSingle param).
+        if not 0 <= self.fee < 1 << 24:
+            raise ValueError(f"fee {self.fee} out of uint24 range")
+
+
+def _registry(entries: dict) -> MappingProxyType:
+    """Freeze a name-keyed registry, interning the keys for fast lookups."""
+    return MappingProxyType({sys.intern(k): v for k, v in entries.items()})
+
 
 # --- Token registry ---
-TOKENS = {
+TOKENS = _registry({
     "USDC": Token("USDC", USDC, 6, 9),
     "WETH": Token("WETH", WETH, 18, 3),
     "DAI": Token("DAI", DAI, 18, 2),
     "USDT": Token("USDT", USDT, 6, 2),
     "WBTC": Token("WBTC", WBTC, 8, 0),
-}
+})
 
 # --- Swap pair registry ---
-PAIRS = {
+PAIRS = _registry({
     "USDC/WETH": SwapPair(TOKENS["USDC"], TOKENS["WETH"], POOL_USDC_WETH_030, 3000),
     "DAI/WETH": SwapPair(TOKENS["DAI"], TOKENS["WETH"], "0xC2e9F25Be6257c210d7Adf0D4Cd6E3E881ba25f8", 3000),
     "WBTC/WETH": SwapPair(TOKENS["WBTC"], TOKENS["WETH"], "0xCBCdF9626bC03E24f779434178A73a0B4bad62eD", 3000),
     "USDT/WETH": SwapPair(TOKENS["USDT"], TOKENS["WETH"], "0x4e68Ccd3E89f51C3074ca5072bbAC773960dFa36", 3000),
-}
+})
 
 # --- ABIs (minimal) ---
 ERC20_ABI = [
@@ -0,0 +1,64 @@
+"""Cached contract handles and pre-encoded calldata for hot call sites.
+
+``w3.eth.contract()`` parses its ABI and builds function proxies every
+time it is called; ``get_contract`` builds each (web3, address, ABI)
+handle once. Transactions sent on every swap (approve, exactInputSingle)
+skip ContractFunction entirely: their calldata is the cached selector
+plus eth_abi-encoded arguments, sent with ``w3.eth.send_transaction``.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from eth_abi import encode
+from web3 import Web3
+from web3.contract import Contract
+
+from .caveats import APPROVE_SIG, EXACT_INPUT_SINGLE_SIG, selector_for
+from .constants import SWAP_ROUTER_02
+
+_APPROVE_PREFIX = bytes.fromhex(selector_for(APPROVE_SIG)[2:])
+_EXACT_INPUT_SINGLE_PREFIX = bytes.fromhex(selector_for(EXACT_INPUT_SINGLE_SIG)[2:])
+_EXACT_INPUT_SINGLE_PARAMS = "(address,address,uint24,address,uint256,uint256,uint160)"
+
+# ABIs are module-level lists (unhashable), so the cache is keyed by their
+# id(). Holding a reference here keeps each id unique for the process.
+_ABIS: dict[int, list] = {}
+
+
+def get_contract(w3: Web3, address: str, abi: list) -> Contract:
+    """Return the contract handle for *address* and *abi*, built once per w3."""
+    _ABIS.setdefault(id(abi), abi)
+    return _contract(w3, address, id(abi))
+
+
+# Bounded: the cache holds each Web3 it has seen (and with it the provider
+# and HTTP session), so throwaway instances must eventually be evicted. A
+# process normally uses one or two Web3s and a handful of contracts each.
+@lru_cache(maxsize=32)
+def _contract(w3: Web3, address: str, abi_id: int) -> Contract:
+    return w3.eth.contract(address=address, abi=_ABIS[abi_id])
+
+
+def approve_call(token: str, spender: str, amount: int) -> dict:
+    """``token.approve(spender, amount)`` as a transaction dict (to, data)."""
+    data = _APPROVE_PREFIX + encode(["address", "uint256"], [spender, amount])
+    return {"to": token, "data": "0x" + data.hex()}
+
+
+def exact_input_single_call(
+    token_in: str,
+    token_out: str,
+    fee: int,
+    recipient: str,
+    amount_in: int,
+    sqrt_price_limit_x96: int = 0,
+) -> dict:
+    """SwapRouter02 ``exactInputSingle`` as a transaction dict (to, data).
+
+    ``amountOutMinimum`` is always 0, as everywhere in the POC.
+    """
+    params = (token_in, token_out, fee, recipient, amount_in, 0, sqrt_price_limit_x96)
+    data = _EXACT_INPUT_SINGLE_PREFIX + encode([_EXACT_INPUT_SINGLE_PARAMS], [params])
+    return {"to": SWAP_ROUTER_02, "data": "0x" + data.hex()}
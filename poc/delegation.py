@@ -12,17 +12,25 @@ execution (via web3 on Anvil) for delegation enforcement.
 
 from __future__ import annotations
 
+import re
+import sys
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from typing import Any
+from functools import lru_cache
+from itertools import product
+from types import MappingProxyType
+from typing import Any, Callable
 
 from web3 import Web3
 
+from .caveats import Caveats
+
 
 # ---------------------------------------------------------------------------
 # Data structures
 # ---------------------------------------------------------------------------
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Caveat:
     """A single enforcement rule within a delegation.
 
@@ -35,13 +43,71 @@ class Caveat:
           - AllowedTargets: list[str]  (allowed contract addresses)
           - AllowedMethods: list[str]  (allowed 4-byte selectors, hex)
           - ERC20TransferAmount: dict  {"token": str, "maxAmount": int}
+
+        Mapping terms are stored as a read-only copy, so a caveat cannot
+        change after construction. Caveats whose term values are hashable
+        can be hashed, and so can the Delegation that holds them.
     """
 
     enforcer: str
     terms: Any
+    _cap: int | None = field(default=None, init=False, repr=False, compare=False)
+    _allowed: frozenset | None = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+    # AllowedMethods only: the selector bytes as a tuple, for bytes.startswith.
+    _selectors: tuple[bytes, ...] = field(
+        default=(), init=False, repr=False, compare=False,
+    )
+    # Hashable stand-in for (enforcer, terms), built by the first __hash__.
+    _key: tuple | None = field(default=None, init=False, repr=False, compare=False)
+    # The _ENFORCERS entry for this caveat's type, or None if unknown.
+    _enforce: Callable | None = field(
+        default=None, init=False, repr=False, compare=False,
+    )
 
-
-@dataclass(frozen=True)
+    def __post_init__(self) -> None:
+        if isinstance(self.terms, Mapping):
+            object.__setattr__(self, "terms", MappingProxyType(dict(self.terms)))
+        object.__setattr__(self, "_enforce", _ENFORCERS.get(self.enforcer))
+
+        # Normalize terms once here so enforcement doesn't repeat the
+        # lookups and conversions on every call.
+        if self.enforcer == "ERC20TransferAmount":
+            object.__setattr__(self, "_cap", int(self.terms["maxAmount"]))
+        elif self.enforcer == "AllowedTargets":
+            object.__setattr__(
+                self, "_allowed", frozenset(map(_norm_addr, self.terms)),
+            )
+        elif self.enforcer == "AllowedMethods":
+            allowed = _four_byte_selectors(self.terms)
+            object.__setattr__(self, "_allowed", allowed)
+            object.__setattr__(self, "_selectors", _selector_prefixes(allowed))
+
+    def __hash__(self) -> int:
+        # terms may be a list or mapping, so hash a frozen copy instead. It
+        # is built here rather than in __post_init__ so that terms holding
+        # unhashable values only fail when the caveat is actually hashed.
+        if self._key is None:
+            terms = self.terms
+            if isinstance(terms, Mapping):
+                key = frozenset(terms.items())
+            elif isinstance(terms, list):
+                key = tuple(terms)
+            else:
+                key = terms
+            object.__setattr__(self, "_key", (self.enforcer, key))
+        return hash(self._key)
+
+    def __reduce__(self):
+        # mappingproxy can't be pickled; rebuild from a plain dict copy
+        terms = self.terms
+        if isinstance(terms, MappingProxyType):
+            terms = dict(terms)
+        return (Caveat, (self.enforcer, terms))
+
+
+@dataclass(frozen=True, slots=True)
 class Delegation:
     """A delegation from a delegator to a delegatee with enforcement caveats.
 
@@ -58,6 +124,56 @@ class Delegation:
     delegator: str
     delegatee: str
     caveats: tuple[Caveat, ...] = field(default_factory=tuple)
+    # Every allowed (target, selector bytes) combination, or None when the
+    # delegation lacks either an AllowedTargets or an AllowedMethods caveat.
+    _pairs: frozenset[tuple[str, bytes]] | None = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+    # The caveats not covered by _pairs, checked individually.
+    _rest: tuple[Caveat, ...] = field(
+        default=(), init=False, repr=False, compare=False,
+    )
+    # Normalized delegatee, compared against the caller on every validation.
+    _delegatee_key: str = field(
+        default="", init=False, repr=False, compare=False,
+    )
+    # The validator returned by compile(), built on first use.
+    _validator: Callable[[str, bytes, int], None] | None = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_delegatee_key", _norm_addr(self.delegatee))
+        targets = methods = None
+        rest = []
+        for caveat in self.caveats:
+            if caveat.enforcer == "AllowedTargets":
+                allowed = caveat._allowed
+                targets = allowed if targets is None else targets & allowed
+            elif caveat.enforcer == "AllowedMethods":
+                allowed = caveat._allowed
+                methods = allowed if methods is None else methods & allowed
+            else:
+                rest.append(caveat)
+        if targets is not None and methods is not None:
+            object.__setattr__(self, "_pairs", frozenset(product(targets, methods)))
+            object.__setattr__(self, "_rest", tuple(rest))
+
+    def __reduce__(self):
+        # Pickle the public fields only; the derived state (including a
+        # compiled validator closure) is rebuilt on unpickling.
+        return (Delegation, (self.delegator, self.delegatee, self.caveats))
+
+    def compile(self) -> Callable[[str, bytes, int], None]:
+        """Return a validator ``check(target, calldata, value=0)`` for this delegation.
+
+        The validator runs every caveat like ``validate_delegation`` (minus
+        the caller check), with all normalization and dispatch resolved up
+        front. It is built once per delegation and cached.
+        """
+        if self._validator is None:
+            object.__setattr__(self, "_validator", _compile_delegation(self))
+        return self._validator
 
 
 # ---------------------------------------------------------------------------
@@ -73,6 +189,45 @@ class EnforcementError(Exception):
         super().__init__(f"{enforcer}: {reason}")
 
 
+# ---------------------------------------------------------------------------
+# Address and selector normalization
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=4096)
+def _norm_addr(address: str) -> str:
+    """Return the canonical form of *address* used for comparisons.
+
+    Lowercase hex with a ``0x`` prefix is enough for equality — EIP-55
+    checksumming costs a keccak per address and only matters for display.
+    Like ``Web3.to_checksum_address``, the prefix is optional and anything
+    that isn't 20 bytes of hex raises ValueError. The result is interned so
+    repeated comparisons against the same address short-circuit on identity,
+    and memoized because the same few addresses recur on every enforcement.
+    """
+    hex_part = address.lower().removeprefix("0x")
+    if not _ADDRESS_HEX.fullmatch(hex_part):
+        raise ValueError(f"{address!r} is not a 20-byte hex address")
+    return sys.intern("0x" + hex_part)
+
+
+_ADDRESS_HEX = re.compile(r"[0-9a-f]{40}")
+
+
+# EIP-55 form for error messages. Violations name the same few addresses
+# over and over (fuzz/replay loops, violation matrices), so memoize the keccak.
+_checksum = lru_cache(maxsize=4096)(Web3.to_checksum_address)
+
+
+@lru_cache(maxsize=1024)
+def _selector_bytes(selector: str) -> bytes:
+    """Return the raw 4 bytes of a hex *selector* (0x prefix optional).
+
+    Calldata already carries the selector as bytes, so comparing bytes
+    avoids hex-encoding every incoming call.
+    """
+    return bytes.fromhex(selector.removeprefix("0x"))
+
+
 # ---------------------------------------------------------------------------
 # Individual enforcer functions (off-chain / pure Python)
 # ---------------------------------------------------------------------------
@@ -82,13 +237,17 @@ def enforce_allowed_targets(target: str, allowed: list[str]) -> None:
 
     Raises EnforcementError if the target is not allowed.
     """
-    normalized_target = Web3.to_checksum_address(target)
-    normalized_allowed = [Web3.to_checksum_address(a) for a in allowed]
-    if normalized_target not in normalized_allowed:
+    _check_allowed_targets(target, frozenset(map(_norm_addr, allowed)))
+
+
+def _check_allowed_targets(target: str, allowed: frozenset[str]) -> None:
+    """AllowedTargets check against a pre-normalized *allowed* set."""
+    if _norm_addr(target) not in allowed:
+        # EIP-55 checksumming is only paid for on the error path.
         raise EnforcementError(
             "AllowedTargets",
-            f"target {normalized_target} not in allowed list "
-            f"[{', '.join(normalized_allowed)}]",
+            f"target {_checksum(target)} not in allowed list "
+            f"[{', '.join(sorted(map(_checksum, allowed)))}]",
         )
 
 
@@ -104,21 +263,43 @@ def enforce_allowed_methods(calldata: bytes, allowed: list[str]) -> None:
     allowed : list[str]
         Hex-encoded 4-byte selectors (with or without 0x prefix).
     """
+    _check_allowed_methods(
+        calldata, _selector_prefixes(_four_byte_selectors(allowed)),
+    )
+
+
+def _four_byte_selectors(selectors) -> frozenset[bytes]:
+    """Decode hex *selectors*, keeping only the 4-byte ones.
+
+    Entries of any other length could never equal a selector. Left in,
+    they would match as a shorter prefix in ``_check_allowed_methods`` or
+    as-is in ``Delegation._pairs``, so they are dropped here, once, for
+    both paths.
+    """
+    return frozenset(s for s in map(_selector_bytes, selectors) if len(s) == 4)
+
+
+def _selector_prefixes(selectors: frozenset[bytes]) -> tuple[bytes, ...]:
+    """The decoded *selectors* as a sorted tuple, for ``bytes.startswith``."""
+    return tuple(sorted(selectors))
+
+
+def _check_allowed_methods(calldata: bytes, allowed: tuple[bytes, ...]) -> None:
+    """AllowedMethods check against pre-decoded *allowed* selectors.
+
+    ``calldata.startswith(allowed)`` compares the prefixes in C without
+    slicing out (and, for a bytearray, copying) the selector first.
+    """
     if len(calldata) < 4:
         raise EnforcementError(
             "AllowedMethods",
             f"calldata too short ({len(calldata)} bytes, need >= 4)",
         )
-    selector = "0x" + calldata[:4].hex()
-    normalized_allowed = []
-    for a in allowed:
-        s = a if a.startswith("0x") else "0x" + a
-        normalized_allowed.append(s.lower())
-    if selector.lower() not in normalized_allowed:
+    if not calldata.startswith(allowed):
         raise EnforcementError(
             "AllowedMethods",
-            f"selector {selector} not in allowed list "
-            f"[{', '.join(normalized_allowed)}]",
+            f"selector 0x{calldata[:4].hex()} not in allowed list "
+            f"[{', '.join(sorted('0x' + a.hex() for a in allowed))}]",
         )
 
 
@@ -174,46 +355,201 @@ def validate_delegation(
         If the caller is not the delegatee.
     """
     # Check caller is the delegatee
-    if Web3.to_checksum_address(caller) != Web3.to_checksum_address(delegation.delegatee):
+    if _norm_addr(caller) != delegation._delegatee_key:
         raise ValueError(
             f"caller {caller} is not the delegatee {delegation.delegatee}"
         )
 
-    # Run each caveat enforcer
-    for caveat in delegation.caveats:
-        _enforce_caveat(caveat, target=target, calldata=calldata, value=value)
+    delegation.compile()(target, calldata, value)
 
 
-def _enforce_caveat(
-    caveat: Caveat,
+def validate_many(
+    delegation: Delegation,
+    steps,
     *,
+    caller: str,
+) -> None:
+    """Validate a sequence of delegated calls against one delegation.
+
+    Equivalent to calling ``validate_delegation`` once per step, but the
+    caller check runs once and the per-step loop works entirely on local
+    names, which matters for fuzz/replay loops with many steps.
+
+    Parameters
+    ----------
+    delegation : Delegation
+        The delegation to validate against.
+    steps : iterable of (target, calldata, value)
+        The calls to check, in order.
+    caller : str
+        The address attempting to use the delegation (must be the delegatee).
+
+    Raises
+    ------
+    EnforcementError
+        On the first step that fails any caveat check.
+    ValueError
+        If the caller is not the delegatee.
+    """
+    if _norm_addr(caller) != delegation._delegatee_key:
+        raise ValueError(
+            f"caller {caller} is not the delegatee {delegation.delegatee}"
+        )
+
+    check = delegation.compile()
+    for target, calldata, value in steps:
+        check(target, calldata, value)
+
+
+def validate_against_many(
+    delegations,
+    *,
+    caller: str,
+    target: str,
+    calldata: bytes,
+    value: int = 0,
+) -> list[bool]:
+    """Check one call against many delegations.
+
+    Parameters
+    ----------
+    delegations : iterable of Delegation
+        Candidate delegations.
+    caller : str
+        The address attempting the call.
+    target : str
+        The contract address being called.
+    calldata : bytes
+        The calldata for the call.
+    value : int
+        The ETH value being sent (in wei).
+
+    Returns
+    -------
+    list[bool]
+        For each delegation, whether *caller* is its delegatee and the call
+        satisfies all of its caveats.
+    """
+    caller_key = _norm_addr(caller)
+    results = []
+    for delegation in delegations:
+        if delegation._delegatee_key != caller_key:
+            results.append(False)
+            continue
+        try:
+            delegation.compile()(target, calldata, value)
+        except EnforcementError:
+            results.append(False)
+        else:
+            results.append(True)
+    return results
+
+
+def _compile_delegation(delegation: Delegation) -> Callable[[str, bytes, int], None]:
+    """Specialize the caveat checks of *delegation* into one closure."""
+    pairs = delegation._pairs
+    rest = delegation._rest
+    if pairs is None or any(c.enforcer != "ERC20TransferAmount" for c in rest):
+        # Nothing to specialize; fall back to the generic caveat loop.
+        def check(target: str, calldata: bytes, value: int = 0) -> None:
+            _check_call(delegation, target, calldata, value)
+
+        return check
+
+    caps = tuple((c._cap, c.terms.get("token")) for c in rest)
+
+    def check(target: str, calldata: bytes, value: int = 0) -> None:
+        if len(calldata) < 4 or (
+            (_norm_addr(target), bytes(calldata[:4])) not in pairs
+        ):
+            # Let the generic loop work out (and report) which caveat failed.
+            _check_call(delegation, target, calldata, value)
+            return
+        if caps:
+            amount = _extract_uint256_param(calldata, param_index=1)
+            for max_amount, token in caps:
+                enforce_erc20_transfer_amount(amount, max_amount, token)
+
+    return check
+
+
+def _check_call(
+    delegation: Delegation,
     target: str,
     calldata: bytes,
     value: int,
 ) -> None:
-    """Dispatch to the correct enforcer for a single caveat."""
-    if caveat.enforcer == "AllowedTargets":
-        enforce_allowed_targets(target, caveat.terms)
+    """Run every caveat of *delegation* against a single call."""
+    pairs = delegation._pairs
+    if pairs is not None and len(calldata) >= 4 and (
+        (_norm_addr(target), bytes(calldata[:4])) in pairs
+    ):
+        # One lookup settled every target and method caveat.
+        caveats = delegation._rest
+    else:
+        # Either no pair set, or something will fail: run the caveats in
+        # order so the first failing enforcer is the one reported.
+        caveats = delegation.caveats
+    amount = None
+    for caveat in caveats:
+        if amount is None and caveat._cap is not None:
+            # Decode the transfer amount once, on first use, and share it
+            # across every ERC20TransferAmount caveat.
+            amount = _extract_uint256_param(calldata, param_index=1)
+        _enforce_caveat(
+            caveat, target=target, calldata=calldata, value=value, amount=amount,
+        )
 
-    elif caveat.enforcer == "AllowedMethods":
-        enforce_allowed_methods(calldata, caveat.terms)
 
-    elif caveat.enforcer == "ERC20TransferAmount":
-        # For ERC-20 transfers, extract the amount from calldata.
-        # approve(address,uint256) and transfer(address,uint256) both
-        # encode the amount as the second parameter (bytes 36-68).
-        amount = _extract_uint256_param(calldata, param_index=1)
-        enforce_erc20_transfer_amount(
-            amount=amount,
-            max_amount=caveat.terms["maxAmount"],
-            token=caveat.terms.get("token"),
-        )
+def _enforce_caveat(
+    caveat: Caveat,
+    *,
+    target: str,
+    calldata: bytes,
+    value: int,
+    amount: int | None = None,
+) -> None:
+    """Dispatch to the correct enforcer for a single caveat.
 
-    else:
+    *amount* is the already-decoded transfer amount, if the caller has it.
+    The enforcer itself was resolved when the caveat was built.
+    """
+    enforcer = caveat._enforce
+    if enforcer is None:
         raise EnforcementError(
             caveat.enforcer,
             f"unknown enforcer type: {caveat.enforcer}",
         )
+    enforcer(caveat, target, calldata, value, amount)
+
+
+def _do_allowed_targets(caveat, target, calldata, value, amount) -> None:
+    _check_allowed_targets(target, caveat._allowed)
+
+
+def _do_allowed_methods(caveat, target, calldata, value, amount) -> None:
+    _check_allowed_methods(calldata, caveat._selectors)
+
+
+def _do_erc20_transfer_amount(caveat, target, calldata, value, amount) -> None:
+    # For ERC-20 transfers, extract the amount from calldata.
+    # approve(address,uint256) and transfer(address,uint256) both
+    # encode the amount as the second parameter (bytes 36-68).
+    if amount is None:
+        amount = _extract_uint256_param(calldata, param_index=1)
+    enforce_erc20_transfer_amount(
+        amount=amount,
+        max_amount=caveat._cap,
+        token=caveat.terms.get("token"),
+    )
+
+
+# Enforcer name -> check(caveat, target, calldata, value, amount)
+_ENFORCERS = {
+    "AllowedTargets": _do_allowed_targets,
+    "AllowedMethods": _do_allowed_methods,
+    "ERC20TransferAmount": _do_erc20_transfer_amount,
+}
 
 
 def _extract_uint256_param(calldata: bytes, param_index: int) -> int:
@@ -247,7 +583,7 @@ def _extract_uint256_param(calldata: bytes, param_index: int) -> int:
 def delegation_from_caveat_map(
     delegator: str,
     delegatee: str,
-    caveat_map: dict,
+    caveat_map: dict | Caveats,
 ) -> Delegation:
     """Convert a Phase 0 caveat map dict to a Phase 1 Delegation object.
 
@@ -260,14 +596,29 @@ def delegation_from_caveat_map(
         Address of the account granting delegation.
     delegatee : str
         Address of the account receiving delegation.
-    caveat_map : dict
-        Output of usdc_weth_swap_caveats() from caveats.py.
+    caveat_map : dict or Caveats
+        Output of usdc_weth_swap_caveats() from caveats.py, or its
+        ``Caveats`` form.
 
     Returns
     -------
     Delegation
         A Delegation with caveats derived from the caveat map.
     """
+    if isinstance(caveat_map, Caveats):
+        return Delegation(
+            delegator=delegator,
+            delegatee=delegatee,
+            caveats=(
+                Caveat("AllowedTargets", list(caveat_map.targets)),
+                Caveat("AllowedMethods", list(caveat_map.methods)),
+                Caveat("ERC20TransferAmount", {
+                    "token": caveat_map.token,
+                    "maxAmount": caveat_map.cap,
+                }),
+            ),
+        )
+
     caveats = []
 
     if "AllowedTargets" in caveat_map:
@@ -336,6 +687,10 @@ def execute_delegated_call(
     EnforcementError
         If any caveat check fails (call is NOT executed).
     """
+    # Imported here so validation alone doesn't pull in the anvil
+    # lifecycle module (requests, subprocess, a shared HTTP session).
+    from .fork import fast_receipt
+
     # 1. Validate all caveats off-chain first
     validate_delegation(
         delegation,
@@ -358,7 +713,7 @@ def execute_delegated_call(
             "data": calldata,
             "value": value,
         })
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = fast_receipt(w3, tx_hash)
         if receipt["status"] != 1:
             raise RuntimeError(
                 f"Delegated call to {target} reverted on-chain"
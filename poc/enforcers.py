@@ -17,10 +17,222 @@ Contract interfaces (Solidity equivalent):
 
     ValueLimitEnforcer:
         enforce(uint256 amount, uint256 cap) → reverts if amount > cap
+
+The allowlist enforcers also come in a specialized form, deployed once per
+allowlist with the allowed values baked into the bytecode:
+    enforce(address target) / enforce(bytes4 selector)
+
+CombinedEnforcer bakes in all three caveats of a delegation:
+    enforceAll(address target, bytes4 selector, uint256 amount)
 """
 
+import struct
+from functools import cache, lru_cache
+
 from web3 import Web3
 
+from .fork import fast_receipt, rpc_batch
+
+
+# ---------------------------------------------------------------------------
+# Bytecode assembler
+# ---------------------------------------------------------------------------
+
+_OPCODES = {
+    "STOP": 0x00, "ADD": 0x01, "MUL": 0x02, "SUB": 0x03,
+    "LT": 0x10, "GT": 0x11, "SLT": 0x12, "SGT": 0x13,
+    "EQ": 0x14, "ISZERO": 0x15, "XOR": 0x18, "SHR": 0x1c,
+    "CALLDATALOAD": 0x35, "CALLDATASIZE": 0x36,
+    "POP": 0x50, "MLOAD": 0x51, "MSTORE": 0x52,
+    "JUMP": 0x56, "JUMPI": 0x57, "JUMPDEST": 0x5b,
+    "DUP1": 0x80, "DUP2": 0x81, "DUP3": 0x82, "DUP4": 0x83,
+    "SWAP1": 0x90, "SWAP2": 0x91,
+    "RETURN": 0xf3, "REVERT": 0xfd,
+}
+
+
+class _Assembler:
+    """Tiny EVM assembler writing straight into a bytearray.
+
+    Jump targets are named labels. ``push_label`` emits a PUSH placeholder
+    and records its byte index; ``hex()`` patches every placeholder with the
+    label's byte offset, so no offsets are ever counted by hand.
+    """
+
+    def __init__(self) -> None:
+        self.code = bytearray()
+        self._labels: dict[str, int] = {}
+        self._fixups: list[tuple[int, int, str]] = []
+
+    def op(self, *names: str) -> None:
+        for name in names:
+            self.code.append(_OPCODES[name])
+
+    def push(self, value: int, size: int = 1) -> None:
+        self.code.append(0x5f + size)  # PUSH<size>
+        self.code += value.to_bytes(size, "big")
+
+    def push_label(self, label: str, size: int = 1) -> None:
+        self.code.append(0x5f + size)  # PUSH<size>
+        self._fixups.append((len(self.code), size, label))
+        self.code += bytes(size)  # patched in hex()
+
+    def label(self, label: str) -> None:
+        self._labels[label] = len(self.code)
+        self.op("JUMPDEST")
+
+    def hex(self) -> str:
+        for idx, size, label in self._fixups:
+            self.code[idx : idx + size] = self._labels[label].to_bytes(size, "big")
+        return self.code.hex()
+
+
+def _selector_guard(asm: _Assembler, selector: bytes) -> None:
+    """Jump to ``bad_selector`` unless calldata starts with *selector*.
+
+    XOR is zero only on a match, so the matching call falls straight
+    through with no JUMPDEST. Every runtime using this guard must end with
+    ``_emit_revert(asm, "bad_selector")``.
+    """
+    asm.push(0x00)
+    asm.op("CALLDATALOAD")
+    asm.push(0xe0)
+    asm.op("SHR")
+    asm.push(int.from_bytes(selector, "big"), 4)
+    asm.op("XOR")
+    # PUSH2: the revert block sits at the end, past byte 255 for long lists
+    asm.push_label("bad_selector", size=2)
+    asm.op("JUMPI")
+
+
+def _emit_revert(asm: _Assembler, label: str) -> None:
+    """Emit a ``revert(0, 0)`` block reachable by jumping to *label*."""
+    asm.label(label)
+    asm.push(0x00)
+    asm.push(0x00)
+    asm.op("REVERT")
+
+
+def _build_membership_bytecode(selector: bytes) -> str:
+    """Build runtime bytecode for ``enforce(T item, T[] allowed)``.
+
+    Calldata layout (ABI-encoded):
+      [0:4]    selector
+      [4:36]   item (one 32-byte word)
+      [36:68]  offset to dynamic array (always 0x40 = 64)
+      [68:100] array length N
+      [100:100+N*32]  array elements (each 32 bytes)
+
+    Algorithm:
+      1. Extract item from calldata[4:36]
+      2. Extract array length from calldata[68:100]
+      3. Loop: compare item to each element in calldata[100 + i*32]
+      4. If match found → RETURN (success)
+      5. If no match → REVERT
+    """
+    asm = _Assembler()
+    _selector_guard(asm, selector)
+
+    asm.push(0x04)
+    asm.op("CALLDATALOAD")      # [item]
+    asm.push(0x44)
+    asm.op("CALLDATALOAD")      # [N, item]
+    asm.push(0x00)              # [i, N, item]
+
+    asm.label("loop")
+    asm.op("DUP2", "DUP2")      # [i, N, i, N, item]
+    asm.op("LT", "ISZERO")      # [i>=N, i, N, item]
+    asm.push_label("not_found")
+    asm.op("JUMPI")
+
+    # allowed[i] is at calldata offset 100 + i * 32
+    asm.op("DUP1")              # [i, i, N, item]
+    asm.push(0x20)
+    asm.op("MUL")               # [i*32, i, N, item]
+    asm.push(0x64)
+    asm.op("ADD")               # [100+i*32, i, N, item]
+    asm.op("CALLDATALOAD")      # [allowed[i], i, N, item]
+    asm.op("DUP4", "EQ")        # [item==allowed[i], i, N, item]
+    asm.push_label("found")
+    asm.op("JUMPI")
+
+    asm.push(0x01)
+    asm.op("ADD")               # [i+1, N, item]
+    asm.push_label("loop")
+    asm.op("JUMP")
+
+    asm.label("found")
+    asm.op("POP", "POP", "POP")
+    asm.push(0x00)
+    asm.push(0x00)
+    asm.op("RETURN")
+
+    asm.label("not_found")
+    asm.op("POP", "POP", "POP")
+    asm.push(0x00)
+    asm.push(0x00)
+    asm.op("REVERT")
+
+    _emit_revert(asm, "bad_selector")
+    return asm.hex()
+
+
+def _push_const(asm: _Assembler, value: int) -> None:
+    """PUSH *value* with the smallest immediate that fits it."""
+    asm.push(value, max(1, (value.bit_length() + 7) // 8))
+
+
+def _emit_allowlist_check(
+    asm: _Assembler, calldata_offset: int, words: list[int], ok_label: str,
+) -> None:
+    """Revert unless the calldata word at *calldata_offset* is in *words*.
+
+    The allowed words are PUSH immediates compared with an unrolled EQ
+    chain; on a match execution continues at *ok_label* with a clean stack.
+    """
+    asm.push(calldata_offset)
+    asm.op("CALLDATALOAD")      # [item]
+    for word in words:
+        _push_const(asm, word)
+        asm.op("DUP2", "EQ")    # [item==word, item]
+        # PUSH2: unrolled code for long lists can run past byte 255
+        asm.push_label(ok_label, size=2)
+        asm.op("JUMPI")
+
+    asm.push(0x00)
+    asm.push(0x00)
+    asm.op("REVERT")
+
+    asm.label(ok_label)
+    asm.op("POP")
+
+
+def _build_specialized_membership_bytecode(selector: bytes, words: list[int]) -> str:
+    """Build runtime bytecode for ``enforce(T item)`` against a fixed list.
+
+    The allowed *words* are baked into the code as PUSH immediates and
+    compared with an unrolled EQ chain, so the caller passes only the item:
+    no array in calldata, and no CALLDATALOAD/MUL/ADD per element.
+    """
+    asm = _Assembler()
+    _selector_guard(asm, selector)
+    _emit_allowlist_check(asm, 0x04, words, "found")
+    asm.push(0x00)
+    asm.push(0x00)
+    asm.op("RETURN")
+    _emit_revert(asm, "bad_selector")
+    return asm.hex()
+
+
+def _address_words(addresses: list[str]) -> list[int]:
+    """Addresses as the integer value of their ABI words."""
+    return [int(a, 16) for a in addresses]
+
+
+def _bytes4_words(selectors: list[str]) -> list[int]:
+    """Selectors as the integer value of their right-padded ABI words."""
+    return [int(a.removeprefix("0x"), 16) << 224 for a in selectors]
+
 
 # ---------------------------------------------------------------------------
 # AllowedTargetsEnforcer
@@ -38,157 +250,28 @@ from web3 import Web3
 # Selector: keccak256("enforce(address,address[])")[:4]
 
 ALLOWED_TARGETS_ENFORCE_SIG = "enforce(address,address[])"
+_ALLOWED_TARGETS_SELECTOR = Web3.keccak(text=ALLOWED_TARGETS_ENFORCE_SIG)[:4]
 
 
 def _build_allowed_targets_bytecode() -> str:
     """Build runtime bytecode for AllowedTargetsEnforcer.
 
-    Calldata layout (ABI-encoded):
-      [0:4]    selector
-      [4:36]   address target (left-padded to 32 bytes)
-      [36:68]  offset to dynamic array (always 0x40 = 64)
-      [68:100] array length N
-      [100:100+N*32]  array elements (addresses, each 32 bytes)
-
-    Algorithm:
-      1. Extract target from calldata[4:36]
-      2. Extract array length from calldata[68:100]
-      3. Loop: compare target to each element in calldata[100 + i*32]
-      4. If match found → STOP (success)
-      5. If no match → REVERT
+    Addresses are ABI-encoded as left-padded 32-byte words, so this is the
+    generic membership loop keyed on the enforce(address,address[]) selector.
     """
-    # We build the bytecode as a sequence of opcodes.
-    # For readability, we use an assembler-like approach.
-    ops = []
-
-    def push1(val):
-        ops.append(f"60{val:02x}")
-
-    def push4(val):
-        ops.append(f"63{val:08x}")
-
-    def push32(val):
-        ops.append(f"7f{val:064x}")
-
-    def op(name):
-        opcodes = {
-            "STOP": "00", "ADD": "01", "MUL": "02", "SUB": "03",
-            "LT": "10", "GT": "11", "SLT": "12", "SGT": "13",
-            "EQ": "14", "ISZERO": "15",
-            "CALLDATALOAD": "35", "CALLDATASIZE": "36",
-            "POP": "50", "MLOAD": "51", "MSTORE": "52",
-            "JUMP": "56", "JUMPI": "57", "JUMPDEST": "5b",
-            "DUP1": "80", "DUP2": "81", "DUP3": "82", "DUP4": "83",
-            "SWAP1": "90", "SWAP2": "91",
-            "RETURN": "f3", "REVERT": "fd",
-        }
-        ops.append(opcodes[name])
-
-    # --- Function selector check ---
-    # Load selector from calldata
-    push1(0x00)
-    op("CALLDATALOAD")
-    push1(0xe0)
-    ops.append("1c")  # SHR
-
-    # Compare with enforce(address,address[]) selector
-    selector_int = int(Web3.keccak(text=ALLOWED_TARGETS_ENFORCE_SIG)[:4].hex(), 16)
-    push4(selector_int)
-    op("EQ")
-
-    # If selector doesn't match, revert
-    push1(0x0e)  # jump to JUMPDEST at offset 14
-    op("JUMPI")
-    push1(0x00)
-    push1(0x00)
-    op("REVERT")
-
-    # JUMPDEST: selector matched
-    op("JUMPDEST")  # offset 14 (0x0e)
-
-    # --- Load target address ---
-    push1(0x04)      # offset 4 in calldata
-    op("CALLDATALOAD")  # target (32 bytes, address is in lower 20)
-
-    # --- Load array length ---
-    push1(0x44)      # offset 68 (0x44) in calldata
-    op("CALLDATALOAD")  # array length N
-
-    # --- Loop setup ---
-    # Stack: [N, target]
-    # Counter i = 0
-    push1(0x00)      # i = 0
-    # Stack: [i, N, target]
-
-    # LOOP_START JUMPDEST
-    op("JUMPDEST")   # loop_start
-
-    # Check i < N
-    op("DUP2")       # [N, i, N, target]
-    op("DUP2")       # [i, N, i, N, target]
-    op("LT")         # [i<N, i, N, target]
-
-    # If i >= N (not LT), jump to NOT_FOUND
-    op("ISZERO")     # [i>=N, i, N, target]
-    # We'll fill in the jump destination later
-    # For now, calculate: jump to NOT_FOUND
-    push1(0x00)      # placeholder - will be patched
-    not_found_push_idx = len(ops) - 1
-    op("JUMPI")
-
-    # --- Load allowed[i] ---
-    # allowed[i] is at calldata offset: 100 + i * 32 = 0x64 + i * 0x20
-    op("DUP1")       # [i, i, N, target]
-    push1(0x20)      # [32, i, i, N, target]
-    op("MUL")        # [i*32, i, N, target]
-    push1(0x64)      # [100, i*32, i, N, target]
-    op("ADD")        # [100+i*32, i, N, target]
-    op("CALLDATALOAD")  # [allowed[i], i, N, target]
-
-    # Compare target == allowed[i]
-    op("DUP4")       # [target, allowed[i], i, N, target]
-    op("EQ")         # [target==allowed[i], i, N, target]
-
-    # If match, jump to FOUND
-    push1(0x00)      # placeholder
-    found_push_idx = len(ops) - 1
-    op("JUMPI")
-
-    # Increment i
-    push1(0x01)      # [1, i, N, target]
-    op("ADD")        # [i+1, N, target]
-
-    # Jump back to LOOP_START
-    push1(0x13)      # loop_start offset (19 = 0x13)
-    op("JUMP")
-
-    # --- FOUND: target is in the list ---
-    found_offset = sum(len(o) // 2 for o in ops)
-    op("JUMPDEST")
-    # Clean stack and return success (empty return)
-    op("POP")        # pop i
-    op("POP")        # pop N
-    op("POP")        # pop target
-    push1(0x00)
-    push1(0x00)
-    op("RETURN")
-
-    # --- NOT_FOUND: target is not in the list ---
-    not_found_offset = sum(len(o) // 2 for o in ops)
-    op("JUMPDEST")
-    # Clean stack and revert
-    op("POP")        # pop i
-    op("POP")        # pop N
-    op("POP")        # pop target
-    push1(0x00)
-    push1(0x00)
-    op("REVERT")
-
-    # Patch jump destinations
-    ops[found_push_idx] = f"60{found_offset:02x}"
-    ops[not_found_push_idx] = f"60{not_found_offset:02x}"
-
-    return "".join(ops)
+    return _build_membership_bytecode(_ALLOWED_TARGETS_SELECTOR)
+
+
+# Specialized variant: enforce(address target), allowed list baked into code.
+SPECIALIZED_TARGETS_ENFORCE_SIG = "enforce(address)"
+_SPECIALIZED_TARGETS_SELECTOR = Web3.keccak(text=SPECIALIZED_TARGETS_ENFORCE_SIG)[:4]
+
+
+def _build_specialized_allowed_targets_bytecode(allowed: list[str]) -> str:
+    """Build an AllowedTargetsEnforcer runtime with *allowed* hardcoded."""
+    return _build_specialized_membership_bytecode(
+        _SPECIALIZED_TARGETS_SELECTOR, _address_words(allowed),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -209,6 +292,7 @@ def _build_allowed_targets_bytecode() -> str:
 # is structurally identical — we compare 32-byte slots in both cases.
 
 ALLOWED_METHODS_ENFORCE_SIG = "enforce(bytes4,bytes4[])"
+_ALLOWED_METHODS_SELECTOR = Web3.keccak(text=ALLOWED_METHODS_ENFORCE_SIG)[:4]
 
 
 def _build_allowed_methods_bytecode() -> str:
@@ -217,110 +301,23 @@ def _build_allowed_methods_bytecode() -> str:
     Same structure as AllowedTargetsEnforcer. ABI encoding pads bytes4
     to 32 bytes, so the comparison logic is identical.
     """
-    ops = []
-
-    def push1(val):
-        ops.append(f"60{val:02x}")
-
-    def push4(val):
-        ops.append(f"63{val:08x}")
-
-    def op(name):
-        opcodes = {
-            "STOP": "00", "ADD": "01", "MUL": "02",
-            "LT": "10", "EQ": "14", "ISZERO": "15",
-            "CALLDATALOAD": "35",
-            "POP": "50",
-            "JUMP": "56", "JUMPI": "57", "JUMPDEST": "5b",
-            "DUP1": "80", "DUP2": "81", "DUP4": "83",
-            "RETURN": "f3", "REVERT": "fd",
-        }
-        ops.append(opcodes[name])
-
-    # Selector check
-    push1(0x00)
-    op("CALLDATALOAD")
-    push1(0xe0)
-    ops.append("1c")  # SHR
-    selector_int = int(Web3.keccak(text=ALLOWED_METHODS_ENFORCE_SIG)[:4].hex(), 16)
-    push4(selector_int)
-    op("EQ")
-    push1(0x0e)
-    op("JUMPI")
-    push1(0x00)
-    push1(0x00)
-    op("REVERT")
-
-    # Selector matched
-    op("JUMPDEST")  # 0x0e
-
-    # Load first param (bytes4, padded to 32 bytes)
-    push1(0x04)
-    op("CALLDATALOAD")
-
-    # Load array length
-    push1(0x44)
-    op("CALLDATALOAD")
-
-    # Loop counter
-    push1(0x00)
-
-    # LOOP_START
-    op("JUMPDEST")  # 0x13
-
-    op("DUP2")
-    op("DUP2")
-    op("LT")
-    op("ISZERO")
-    push1(0x00)  # placeholder for NOT_FOUND
-    not_found_push_idx = len(ops) - 1
-    op("JUMPI")
-
-    # Load allowed[i]
-    op("DUP1")
-    push1(0x20)
-    op("MUL")
-    push1(0x64)
-    op("ADD")
-    op("CALLDATALOAD")
-
-    # Compare
-    op("DUP4")
-    op("EQ")
-    push1(0x00)  # placeholder for FOUND
-    found_push_idx = len(ops) - 1
-    op("JUMPI")
-
-    # i++
-    push1(0x01)
-    op("ADD")
-    push1(0x13)
-    op("JUMP")
-
-    # FOUND
-    found_offset = sum(len(o) // 2 for o in ops)
-    op("JUMPDEST")
-    op("POP")
-    op("POP")
-    op("POP")
-    push1(0x00)
-    push1(0x00)
-    op("RETURN")
-
-    # NOT_FOUND
-    not_found_offset = sum(len(o) // 2 for o in ops)
-    op("JUMPDEST")
-    op("POP")
-    op("POP")
-    op("POP")
-    push1(0x00)
-    push1(0x00)
-    op("REVERT")
-
-    ops[found_push_idx] = f"60{found_offset:02x}"
-    ops[not_found_push_idx] = f"60{not_found_offset:02x}"
-
-    return "".join(ops)
+    return _build_membership_bytecode(_ALLOWED_METHODS_SELECTOR)
+
+
+# Specialized variant: enforce(bytes4 selector), allowed list baked into code.
+SPECIALIZED_METHODS_ENFORCE_SIG = "enforce(bytes4)"
+_SPECIALIZED_METHODS_SELECTOR = Web3.keccak(text=SPECIALIZED_METHODS_ENFORCE_SIG)[:4]
+
+
+def _build_specialized_allowed_methods_bytecode(allowed: list[str]) -> str:
+    """Build an AllowedMethodsEnforcer runtime with *allowed* hardcoded.
+
+    bytes4 is right-padded in ABI encoding, so each selector is compared
+    as the 32-byte word ``selector << 224``.
+    """
+    return _build_specialized_membership_bytecode(
+        _SPECIALIZED_METHODS_SELECTOR, _bytes4_words(allowed),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -335,6 +332,7 @@ def _build_allowed_methods_bytecode() -> str:
 # ABI: enforce(uint256,uint256)
 
 VALUE_LIMIT_ENFORCE_SIG = "enforce(uint256,uint256)"
+_VALUE_LIMIT_SELECTOR = Web3.keccak(text=VALUE_LIMIT_ENFORCE_SIG)[:4]
 
 
 def _build_value_limit_bytecode() -> str:
@@ -349,113 +347,132 @@ def _build_value_limit_bytecode() -> str:
       1. If amount > cap → REVERT
       2. Else → RETURN (success)
     """
-    ops = []
-
-    def push1(val):
-        ops.append(f"60{val:02x}")
-
-    def push4(val):
-        ops.append(f"63{val:08x}")
-
-    def op(name):
-        opcodes = {
-            "STOP": "00",
-            "GT": "11", "EQ": "14", "ISZERO": "15",
-            "CALLDATALOAD": "35",
-            "POP": "50",
-            "JUMP": "56", "JUMPI": "57", "JUMPDEST": "5b",
-            "RETURN": "f3", "REVERT": "fd",
-        }
-        ops.append(opcodes[name])
-
-    # Selector check
-    push1(0x00)
-    op("CALLDATALOAD")
-    push1(0xe0)
-    ops.append("1c")  # SHR
-    selector_int = int(Web3.keccak(text=VALUE_LIMIT_ENFORCE_SIG)[:4].hex(), 16)
-    push4(selector_int)
-    op("EQ")
-    push1(0x0e)
-    op("JUMPI")
-    push1(0x00)
-    push1(0x00)
-    op("REVERT")
-
-    # Selector matched
-    op("JUMPDEST")  # 0x0e
-
-    # Load cap (second param)
-    push1(0x24)
-    op("CALLDATALOAD")
-
-    # Load amount (first param)
-    push1(0x04)
-    op("CALLDATALOAD")
-
-    # Check amount > cap
-    op("GT")  # (amount > cap) ? 1 : 0
-
-    # If amount > cap, jump to REVERT
-    push1(0x00)  # placeholder
-    revert_push_idx = len(ops) - 1
-    op("JUMPI")
-
-    # amount <= cap: return success
-    push1(0x00)
-    push1(0x00)
-    op("RETURN")
-
-    # amount > cap: revert
-    revert_offset = sum(len(o) // 2 for o in ops)
-    op("JUMPDEST")
-    push1(0x00)
-    push1(0x00)
-    op("REVERT")
-
-    ops[revert_push_idx] = f"60{revert_offset:02x}"
-
-    return "".join(ops)
+    asm = _Assembler()
+    _selector_guard(asm, _VALUE_LIMIT_SELECTOR)
+
+    asm.push(0x24)
+    asm.op("CALLDATALOAD")      # [cap]
+    asm.push(0x04)
+    asm.op("CALLDATALOAD")      # [amount, cap]
+    asm.op("GT")                # [amount > cap]
+    asm.push_label("over_cap")
+    asm.op("JUMPI")
+
+    asm.push(0x00)
+    asm.push(0x00)
+    asm.op("RETURN")
+
+    _emit_revert(asm, "over_cap")
+    _emit_revert(asm, "bad_selector")
+    return asm.hex()
+
+
+# ---------------------------------------------------------------------------
+# CombinedEnforcer (all three caveats, one call)
+# ---------------------------------------------------------------------------
+#
+# Solidity equivalent, with the allowlists and cap fixed at deploy time:
+#   function enforceAll(address target, bytes4 selector, uint256 amount)
+#       external pure
+#   {
+#       require(target is one of ALLOWED_TARGETS);
+#       require(selector is one of ALLOWED_METHODS);
+#       require(amount <= CAP);
+#   }
+#
+# ABI: enforceAll(address,bytes4,uint256)
+
+COMBINED_ENFORCE_SIG = "enforceAll(address,bytes4,uint256)"
+_COMBINED_SELECTOR = Web3.keccak(text=COMBINED_ENFORCE_SIG)[:4]
+
+
+def _build_combined_enforcer_bytecode(
+    allowed_targets: list[str],
+    allowed_methods: list[str],
+    cap: int,
+) -> str:
+    """Build runtime bytecode checking target, method and cap in one call.
+
+    Calldata layout:
+      [0:4]    selector
+      [4:36]   address target
+      [36:68]  bytes4 selector (right-padded)
+      [68:100] uint256 amount
+    """
+    asm = _Assembler()
+    _selector_guard(asm, _COMBINED_SELECTOR)
+    _emit_allowlist_check(asm, 0x04, _address_words(allowed_targets), "target_ok")
+    _emit_allowlist_check(asm, 0x24, _bytes4_words(allowed_methods), "method_ok")
+
+    _push_const(asm, cap)       # [cap]
+    asm.push(0x44)
+    asm.op("CALLDATALOAD")      # [amount, cap]
+    asm.op("GT")                # [amount > cap]
+    asm.push_label("over_cap", size=2)
+    asm.op("JUMPI")
+
+    asm.push(0x00)
+    asm.push(0x00)
+    asm.op("RETURN")
+
+    _emit_revert(asm, "over_cap")
+    _emit_revert(asm, "bad_selector")
+    return asm.hex()
 
 
 # ---------------------------------------------------------------------------
 # Deployment helpers
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=64)
 def _wrap_with_init_code(runtime_hex: str) -> str:
     """Wrap runtime bytecode with init code that deploys it.
 
     The init code copies the runtime bytecode from code to memory
     and returns it, causing the EVM to store it as the contract code.
+    Memoized, so redeploying the same runtime reuses the wrapped hex.
     """
-    runtime_bytes = bytes.fromhex(runtime_hex)
-    runtime_len = len(runtime_bytes)
+    runtime_len = len(runtime_hex) // 2
 
     if runtime_len > 255:
-        # Use PUSH2 for larger bytecodes
-        init_hex = (
-            f"61{runtime_len:04x}"  # PUSH2 runtime_len
-            "600c"                  # PUSH1 12 (init code length)
-            "6000"                  # PUSH1 0 (memory dest)
-            "39"                    # CODECOPY
-            f"61{runtime_len:04x}"  # PUSH2 runtime_len
-            "6000"                  # PUSH1 0
-            "f3"                    # RETURN
-        )
+        push_len = f"61{runtime_len:04x}"  # PUSH2 runtime_len
     else:
-        init_hex = (
-            f"60{runtime_len:02x}"  # PUSH1 runtime_len
-            "600a"                  # PUSH1 10 (init code length)
-            "6000"                  # PUSH1 0 (memory dest)
-            "39"                    # CODECOPY
-            f"60{runtime_len:02x}"  # PUSH1 runtime_len
-            "6000"                  # PUSH1 0
-            "f3"                    # RETURN
-        )
+        push_len = f"60{runtime_len:02x}"  # PUSH1 runtime_len
+    # Two PUSHn runtime_len plus 8 fixed bytes (three PUSH1, CODECOPY, RETURN)
+    init_len = len(push_len) + 8
+
+    init_hex = (
+        push_len                # PUSHn runtime_len
+        + f"60{init_len:02x}"   # PUSH1 init code length (runtime starts here)
+        + "6000"                # PUSH1 0 (memory dest)
+        + "39"                  # CODECOPY
+        + push_len              # PUSHn runtime_len
+        + "6000"                # PUSH1 0
+        + "f3"                  # RETURN
+    )
 
     return init_hex + runtime_hex
 
 
+_BUILDERS = {
+    "allowed_targets": _build_allowed_targets_bytecode,
+    "allowed_methods": _build_allowed_methods_bytecode,
+    "value_limit": _build_value_limit_bytecode,
+}
+
+
+@cache
+def _runtime_hex(kind: str) -> str:
+    """Runtime bytecode for one of the fixed enforcers, built on first use."""
+    return _BUILDERS[kind]()
+
+
+@cache
+def _deploy_hex(kind: str) -> str:
+    """Init code + runtime for one of the fixed enforcers, built on first use."""
+    return _wrap_with_init_code(_runtime_hex(kind))
+
+
 def deploy_enforcer(w3: Web3, sender: str, runtime_hex: str) -> str:
     """Deploy an enforcer contract and return its address.
 
@@ -473,35 +490,157 @@ def deploy_enforcer(w3: Web3, sender: str, runtime_hex: str) -> str:
     str
         The deployed contract address.
     """
-    deploy_data = "0x" + _wrap_with_init_code(runtime_hex)
+    return _deploy_init_code(w3, sender, _wrap_with_init_code(runtime_hex))
+
+
+def deploy_enforcers(w3: Web3, sender: str, runtimes: list[str]) -> list[str]:
+    """Deploy several enforcer runtimes and return their addresses in order.
+
+    The creation txs go out in one JSON-RPC batch with explicit nonces and
+    their receipts come back in a second batch, instead of a send and a
+    receipt round trip per contract. A receipt the node has not produced
+    yet is fetched with ``fast_receipt``.
+    """
+    nonce = w3.eth.get_transaction_count(sender)
+    tx_hashes = rpc_batch(w3, [
+        ("eth_sendTransaction", [{
+            "from": sender,
+            "data": "0x" + _wrap_with_init_code(runtime_hex),
+            "nonce": hex(nonce + i),
+        }])
+        for i, runtime_hex in enumerate(runtimes)
+    ])
+    receipts = rpc_batch(
+        w3, [("eth_getTransactionReceipt", [tx]) for tx in tx_hashes],
+    )
+    addresses = []
+    for tx, raw in zip(tx_hashes, receipts):
+        if raw is None:
+            receipt = fast_receipt(w3, tx)
+            status, address = receipt["status"], receipt["contractAddress"]
+        else:
+            status, address = int(raw["status"], 16), raw["contractAddress"]
+        assert status == 1, "Enforcer deployment failed"
+        addresses.append(Web3.to_checksum_address(address))
+    return addresses
+
+
+def _deploy_init_code(w3: Web3, sender: str, init_hex: str) -> str:
+    """Send a contract-creation tx for *init_hex* and return the address."""
     tx_hash = w3.eth.send_transaction({
         "from": sender,
-        "data": deploy_data,
+        "data": "0x" + init_hex,
     })
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+    receipt = fast_receipt(w3, tx_hash)
     assert receipt["status"] == 1, "Enforcer deployment failed"
     return receipt["contractAddress"]
 
 
 def deploy_allowed_targets_enforcer(w3: Web3, sender: str) -> str:
     """Deploy AllowedTargetsEnforcer and return its address."""
-    return deploy_enforcer(w3, sender, _build_allowed_targets_bytecode())
+    return _deploy_init_code(w3, sender, _deploy_hex("allowed_targets"))
 
 
 def deploy_allowed_methods_enforcer(w3: Web3, sender: str) -> str:
     """Deploy AllowedMethodsEnforcer and return its address."""
-    return deploy_enforcer(w3, sender, _build_allowed_methods_bytecode())
+    return _deploy_init_code(w3, sender, _deploy_hex("allowed_methods"))
 
 
 def deploy_value_limit_enforcer(w3: Web3, sender: str) -> str:
     """Deploy ValueLimitEnforcer and return its address."""
-    return deploy_enforcer(w3, sender, _build_value_limit_bytecode())
+    return _deploy_init_code(w3, sender, _deploy_hex("value_limit"))
+
+
+def deploy_specialized_allowed_targets_enforcer(
+    w3: Web3, sender: str, allowed: list[str],
+) -> str:
+    """Deploy an AllowedTargetsEnforcer for a fixed *allowed* list.
+
+    One contract per allowlist; call it with
+    ``call_specialized_allowed_targets_enforcer``.
+    """
+    runtime_hex = _build_specialized_allowed_targets_bytecode(allowed)
+    return deploy_enforcer(w3, sender, runtime_hex)
+
+
+def deploy_specialized_allowed_methods_enforcer(
+    w3: Web3, sender: str, allowed: list[str],
+) -> str:
+    """Deploy an AllowedMethodsEnforcer for a fixed *allowed* list.
+
+    One contract per allowlist; call it with
+    ``call_specialized_allowed_methods_enforcer``.
+    """
+    runtime_hex = _build_specialized_allowed_methods_bytecode(allowed)
+    return deploy_enforcer(w3, sender, runtime_hex)
+
+
+def deploy_combined_enforcer(
+    w3: Web3,
+    sender: str,
+    allowed_targets: list[str],
+    allowed_methods: list[str],
+    cap: int,
+) -> str:
+    """Deploy a CombinedEnforcer for one delegation's caveats.
+
+    Replaces the three separate enforcers (and their three eth_calls) with a
+    single contract; call it with ``call_combined_enforcer``.
+    """
+    runtime_hex = _build_combined_enforcer_bytecode(
+        allowed_targets, allowed_methods, cap,
+    )
+    return deploy_enforcer(w3, sender, runtime_hex)
 
 
 # ---------------------------------------------------------------------------
 # On-chain enforcement calls
 # ---------------------------------------------------------------------------
 
+_ARRAY_OFFSET = (64).to_bytes(32, "big")  # offset to array data after 2 words
+
+
+def _encode_address(address: str) -> bytes:
+    """ABI-encode *address* as a left-padded 32-byte word."""
+    raw = bytes.fromhex(address.removeprefix("0x"))
+    if len(raw) != 20:
+        raise ValueError(f"address {address!r} is not 20 bytes")
+    return bytes(12) + raw
+
+
+def _encode_bytes4(selector: str) -> bytes:
+    """ABI-encode a hex *selector* as a right-padded 32-byte word."""
+    raw = bytes.fromhex(selector.removeprefix("0x"))
+    if len(raw) != 4:
+        raise ValueError(f"selector {selector!r} is not 4 bytes")
+    return raw + bytes(28)
+
+
+@lru_cache(maxsize=256)
+def _encode_address_array(allowed: tuple[str, ...]) -> bytes:
+    """ABI-encode the dynamic ``address[]`` tail: offset, length, elements.
+
+    Memoized because the same allowlist is sent with every check.
+    """
+    return (
+        _ARRAY_OFFSET
+        + len(allowed).to_bytes(32, "big")
+        + b"".join([_encode_address(a) for a in allowed])
+    )
+
+
+# selector + two uint256 words whose top 24 bytes are zero
+_VALUE_LIMIT_CALL_U64 = struct.Struct(">4s24xQ24xQ")
+
+
+def _encode_value_limit_call(amount: int, cap: int) -> bytes:
+    """ABI-encode ``enforce(uint256 amount, uint256 cap)`` calldata."""
+    if 0 <= amount < 1 << 64 and 0 <= cap < 1 << 64:
+        # Common case (token amounts): one precompiled pack, no bigint work
+        return _VALUE_LIMIT_CALL_U64.pack(_VALUE_LIMIT_SELECTOR, amount, cap)
+    return _VALUE_LIMIT_SELECTOR + amount.to_bytes(32, "big") + cap.to_bytes(32, "big")
+
+
 def call_allowed_targets_enforcer(
     w3: Web3,
     enforcer_address: str,
@@ -513,18 +652,14 @@ def call_allowed_targets_enforcer(
 
     Returns True if the target is allowed, raises if reverted.
     """
-    selector = Web3.keccak(text=ALLOWED_TARGETS_ENFORCE_SIG)[:4]
     # ABI-encode: address target, address[] allowed
-    encoded_target = bytes.fromhex(target[2:].lower().zfill(64))
-    # Dynamic array: offset, length, elements
-    offset = (64).to_bytes(32, "big")  # offset to array data
-    length = len(allowed).to_bytes(32, "big")
-    elements = b"".join(
-        bytes.fromhex(a[2:].lower().zfill(64)) for a in allowed
+    calldata = (
+        _ALLOWED_TARGETS_SELECTOR
+        + _encode_address(target)
+        + _encode_address_array(tuple(allowed))
     )
-    calldata = selector + encoded_target + offset + length + elements
 
-    result = w3.eth.call({
+    w3.eth.call({
         "from": sender,
         "to": enforcer_address,
         "data": "0x" + calldata.hex(),
@@ -543,22 +678,16 @@ def call_allowed_methods_enforcer(
 
     Returns True if the method is allowed, raises if reverted.
     """
-    selector = Web3.keccak(text=ALLOWED_METHODS_ENFORCE_SIG)[:4]
     # ABI-encode: bytes4 method (right-padded to 32), bytes4[] allowed
-    method_hex = method_selector[2:] if method_selector.startswith("0x") else method_selector
-    # bytes4 is right-padded in ABI encoding
-    encoded_method = bytes.fromhex(method_hex.ljust(64, "0"))
-    offset = (64).to_bytes(32, "big")
-    length = len(allowed).to_bytes(32, "big")
-    elements = b"".join(
-        bytes.fromhex(
-            (a[2:] if a.startswith("0x") else a).ljust(64, "0")
-        )
-        for a in allowed
+    calldata = (
+        _ALLOWED_METHODS_SELECTOR
+        + _encode_bytes4(method_selector)
+        + _ARRAY_OFFSET
+        + len(allowed).to_bytes(32, "big")
+        + b"".join([_encode_bytes4(a) for a in allowed])
     )
-    calldata = selector + encoded_method + offset + length + elements
 
-    result = w3.eth.call({
+    w3.eth.call({
         "from": sender,
         "to": enforcer_address,
         "data": "0x" + calldata.hex(),
@@ -577,12 +706,73 @@ def call_value_limit_enforcer(
 
     Returns True if amount <= cap, raises if reverted.
     """
-    selector = Web3.keccak(text=VALUE_LIMIT_ENFORCE_SIG)[:4]
-    encoded_amount = amount.to_bytes(32, "big")
-    encoded_cap = cap.to_bytes(32, "big")
-    calldata = selector + encoded_amount + encoded_cap
+    calldata = _encode_value_limit_call(amount, cap)
+
+    w3.eth.call({
+        "from": sender,
+        "to": enforcer_address,
+        "data": "0x" + calldata.hex(),
+    })
+    return True
+
+
+def call_specialized_allowed_targets_enforcer(
+    w3: Web3,
+    enforcer_address: str,
+    target: str,
+    sender: str,
+) -> bool:
+    """Call a specialized AllowedTargetsEnforcer.
+
+    Returns True if the target is allowed, raises if reverted.
+    """
+    calldata = _SPECIALIZED_TARGETS_SELECTOR + _encode_address(target)
+    w3.eth.call({
+        "from": sender,
+        "to": enforcer_address,
+        "data": "0x" + calldata.hex(),
+    })
+    return True
+
+
+def call_specialized_allowed_methods_enforcer(
+    w3: Web3,
+    enforcer_address: str,
+    method_selector: str,
+    sender: str,
+) -> bool:
+    """Call a specialized AllowedMethodsEnforcer.
+
+    Returns True if the method is allowed, raises if reverted.
+    """
+    calldata = _SPECIALIZED_METHODS_SELECTOR + _encode_bytes4(method_selector)
+    w3.eth.call({
+        "from": sender,
+        "to": enforcer_address,
+        "data": "0x" + calldata.hex(),
+    })
+    return True
 
-    result = w3.eth.call({
+
+def call_combined_enforcer(
+    w3: Web3,
+    enforcer_address: str,
+    target: str,
+    method_selector: str,
+    amount: int,
+    sender: str,
+) -> bool:
+    """Call a CombinedEnforcer with all three checks in one eth_call.
+
+    Returns True if every caveat passes, raises if reverted.
+    """
+    calldata = (
+        _COMBINED_SELECTOR
+        + _encode_address(target)
+        + _encode_bytes4(method_selector)
+        + amount.to_bytes(32, "big")
+    )
+    w3.eth.call({
         "from": sender,
         "to": enforcer_address,
         "data": "0x" + calldata.hex(),
@@ -1,72 +1,359 @@
-"""Anvil fork lifecycle and web3 connection."""
+"""Anvil fork lifecycle and web3 connection.
 
+JSON-RPC payloads are serialized with orjson when it is installed and
+with the stdlib json module (web3's default) otherwise.
+"""
+
+import json
+import os
+import socket
 import subprocess
+import sys
+import tempfile
 import time
 import signal
+from contextlib import suppress
+from functools import lru_cache
+from pathlib import Path
 
-from web3 import Web3
+import requests
+from hexbytes import HexBytes
+from requests.adapters import HTTPAdapter
+from web3 import HTTPProvider, Web3
+from web3._utils.encoding import Web3JsonEncoder
+from web3.datastructures import AttributeDict
+from web3.exceptions import TransactionNotFound
+from web3.types import RPCEndpoint, RPCResponse, TxReceipt
 
 from .constants import USDC, USDC_BALANCE_SLOT, Token
 
+try:
+    import orjson
+
+    def _json_default(obj):
+        # Same conversions as web3's Web3JsonEncoder
+        if isinstance(obj, AttributeDict):
+            return dict(obj)
+        if isinstance(obj, bytes):
+            return "0x" + bytes(obj).hex()
+        raise TypeError
+
+    def _dumps(obj) -> bytes:
+        try:
+            return orjson.dumps(obj, default=_json_default)
+        except TypeError:
+            # orjson only takes integers up to 64 bits
+            return json.dumps(obj, cls=Web3JsonEncoder).encode()
+
+    # JSON-RPC quantities are hex strings, so replies never carry the
+    # >64-bit integers orjson would read back as floats.
+    _loads = orjson.loads
+
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, cls=Web3JsonEncoder).encode()
+
+    _loads = json.loads
+
+
+class _FastJSONProvider(HTTPProvider):
+    """HTTPProvider using the module's JSON codec (orjson if available)."""
+
+    def encode_rpc_request(self, method: RPCEndpoint, params) -> bytes:
+        return _dumps({
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or [],
+            "id": next(self.request_counter),
+        })
+
+    def decode_rpc_response(self, raw_response: bytes) -> RPCResponse:
+        return _loads(raw_response)
+
+
+# One keep-alive connection pool shared by every local RPC client, so
+# repeated connect() calls and RPC bursts skip the TCP handshake.
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_CONNECTIONS: dict[int, Web3] = {}
+
+
+def _provider(port: int) -> HTTPProvider:
+    return _FastJSONProvider(
+        f"http://127.0.0.1:{port}",
+        request_kwargs={"timeout": 10},
+        session=_SESSION,
+    )
+
+
+# Fork state dumped after a warm run, reloaded on the next start at the
+# same block so reads hit anvil's memory instead of the upstream RPC.
+STATE_CACHE_DIR = Path(
+    os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+) / "ethbox"
+
 
-def start_anvil(rpc_url: str, block: int, port: int = 8545) -> subprocess.Popen:
-    """Launch anvil forking mainnet at *block*. Returns the process handle."""
+def start_anvil(
+    rpc_url: str, block: int, port: int = 8545, use_cache: bool = True,
+) -> subprocess.Popen:
+    """Launch anvil forking mainnet at *block*. Returns the process handle.
+
+    With *use_cache*, state saved by ``save_state`` for the same block is
+    loaded into the fresh fork before it is returned.
+    """
+    proc = launch_anvil(
+        ["--fork-url", rpc_url, "--fork-block-number", str(block)], port,
+    )
+    if use_cache:
+        load_state(connect(port), block)
+    return proc
+
+
+def _state_path(block: int) -> Path:
+    return STATE_CACHE_DIR / f"state_{block}.hex"
+
+
+def load_state(w3: Web3, block: int) -> bool:
+    """Load the cached fork state for *block*, if any. Returns True if loaded."""
+    path = _state_path(block)
+    if not path.exists():
+        return False
+    resp = w3.provider.make_request("anvil_loadState", [path.read_text()])
+    return "error" not in resp
+
+
+def save_state(w3: Web3, block: int) -> None:
+    """Dump the fork's current state to the cache file for *block*."""
+    resp = w3.provider.make_request("anvil_dumpState", [])
+    if "error" in resp:
+        raise RuntimeError(f"anvil_dumpState failed: {resp['error']}")
+    path = _state_path(block)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(resp["result"])
+    tmp.replace(path)  # never leave a half-written cache behind
+
+
+def launch_anvil(args: list[str], port: int, timeout: float = 9.0) -> subprocess.Popen:
+    """Start anvil on *port* with extra *args* and wait until its RPC answers.
+
+    Output goes to DEVNULL: an unread pipe can fill up and block anvil
+    mid-request. Set ``ETHBOX_ANVIL_LOG=1`` to log anvil's requests to a
+    temp file instead; its path is printed to stderr.
+    """
+    cmd = ["anvil", "--port", str(port), *args]
+    if os.environ.get("ETHBOX_ANVIL_LOG"):
+        log = tempfile.NamedTemporaryFile(
+            prefix=f"anvil-{port}-", suffix=".log", delete=False,
+        )
+        print(f"anvil log: {log.name}", file=sys.stderr)
+    else:
+        cmd.append("--silent")
+        log = subprocess.DEVNULL
     proc = subprocess.Popen(
-        [
-            "anvil",
-            "--fork-url", rpc_url,
-            "--fork-block-number", str(block),
-            "--port", str(port),
-            "--silent",
-        ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+        cmd,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+        start_new_session=True,  # own process group, see stop_anvil
     )
-    # Wait for RPC to be ready
-    w3 = Web3(Web3.HTTPProvider(f"http://127.0.0.1:{port}"))
-    for _ in range(30):
+    if log is not subprocess.DEVNULL:
+        log.close()  # the child holds its own descriptor
+    if not wait_for_rpc(port, timeout):
+        stop_anvil(proc)
+        raise RuntimeError(f"Anvil failed to start on port {port}")
+    return proc
+
+
+def wait_for_rpc(port: int, timeout: float = 9.0) -> bool:
+    """Wait until a JSON-RPC server answers on 127.0.0.1:*port*.
+
+    Readiness is probed with raw TCP connects, backing off from 10 ms to
+    200 ms between attempts, so a fast start is seen within milliseconds
+    without an HTTP request per probe. Once a connection is accepted, a
+    single ``web3_clientVersion`` call confirms the RPC is serving.
+
+    Returns False if *timeout* seconds pass first.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while True:
         try:
-            if w3.is_connected():
+            with socket.create_connection(("127.0.0.1", port), timeout=0.05):
                 break
-        except Exception:
-            pass
-        time.sleep(0.3)
-    else:
-        proc.kill()
-        raise RuntimeError("Anvil failed to start")
-    return proc
+        except OSError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+    try:
+        return Web3(_provider(port)).is_connected()
+    except Exception:
+        return False
 
 
 def stop_anvil(proc: subprocess.Popen) -> None:
-    proc.send_signal(signal.SIGTERM)
-    proc.wait(timeout=5)
+    """Stop an anvil started with ``start_new_session=True``.
+
+    The whole process group gets SIGTERM and half a second to exit, then
+    SIGKILL, so teardown never blocks for long on a busy RPC handler.
+    """
+    with suppress(ProcessLookupError):
+        os.killpg(proc.pid, signal.SIGTERM)
+    try:
+        proc.communicate(timeout=0.5)
+    except subprocess.TimeoutExpired:
+        with suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGKILL)
+        proc.communicate(timeout=1)
 
 
 def connect(port: int = 8545) -> Web3:
-    w3 = Web3(Web3.HTTPProvider(f"http://127.0.0.1:{port}"))
-    assert w3.is_connected(), "Cannot reach Anvil RPC"
+    """Return the Web3 instance for the local RPC on *port*.
+
+    The instance is created on first use and then reused, so every caller
+    shares the same provider and keep-alive session.
+    """
+    w3 = _CONNECTIONS.get(port)
+    if w3 is None:
+        w3 = Web3(_provider(port))
+        assert w3.is_connected(), "Cannot reach Anvil RPC"
+        _CONNECTIONS[port] = w3
     return w3
 
 
-def fund_usdc(w3: Web3, address: str, amount: int) -> None:
-    """Set *address*'s USDC balance to *amount* (6-decimal raw units)."""
-    slot = Web3.solidity_keccak(
+def fast_receipt(w3: Web3, tx_hash: HexBytes) -> TxReceipt:
+    """Return the receipt of *tx_hash* sent to an auto-mining anvil.
+
+    anvil mines each transaction as it is submitted, so the receipt is
+    normally there on the first read; ``wait_for_transaction_receipt``
+    would still sleep a 100 ms poll interval first. One retry after
+    10 ms covers a lagging node before falling back to a fast poll, which
+    gives up after 30 s (web3's default is 120 s) so a stuck anvil fails
+    the test quickly.
+    """
+    for _ in range(2):
+        try:
+            return w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            time.sleep(0.01)
+    return w3.eth.wait_for_transaction_receipt(
+        tx_hash, timeout=30, poll_latency=0.02,
+    )
+
+
+# JSON-RPC batches larger than this are split; some nodes reject big batches.
+MAX_BATCH_SIZE = 10
+
+
+def rpc_batch(w3: Web3, calls: list[tuple[str, list]]) -> list:
+    """Send *calls* as JSON-RPC batches and return their results in order.
+
+    Each entry of *calls* is a ``(method, params)`` pair. Independent calls
+    share one HTTP round trip per ``MAX_BATCH_SIZE`` entries instead of
+    paying one each. If the endpoint does not answer a batch with a list,
+    the chunk is resent one request at a time.
+
+    Raises
+    ------
+    RuntimeError
+        If any call returns a JSON-RPC error.
+    """
+    results = []
+    for start in range(0, len(calls), MAX_BATCH_SIZE):
+        chunk = calls[start : start + MAX_BATCH_SIZE]
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(chunk)
+        ]
+        resp = _SESSION.post(
+            w3.provider.endpoint_uri,
+            data=_dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=10,
+        )
+        replies = _loads(resp.content)
+        if isinstance(replies, list):
+            # Batch replies may come back in any order
+            replies.sort(key=lambda r: r["id"])
+        else:
+            replies = [w3.provider.make_request(m, p) for m, p in chunk]
+        for (method, _), reply in zip(chunk, replies):
+            if "error" in reply:
+                raise RuntimeError(f"{method} failed: {reply['error']}")
+            results.append(reply["result"])
+    return results
+
+
+@lru_cache(maxsize=1024)
+def _balance_slot_key(address: str, slot: int) -> str:
+    """Storage key of ``balances[address]`` for a mapping at *slot*, memoized.
+
+    Funding the same account repeatedly skips the keccak and the address
+    parsing after the first call.
+    """
+    return Web3.solidity_keccak(
         ["uint256", "uint256"],
-        [int(address, 16), USDC_BALANCE_SLOT],
+        [int(address, 16), slot],
+    ).hex()
+
+
+MAX_UINT256 = 2**256 - 1
+
+
+@lru_cache(maxsize=1024)
+def _allowance_slot_key(owner: str, spender: str, slot: int) -> str:
+    """Storage key of ``allowance[owner][spender]`` for a mapping at *slot*."""
+    inner = Web3.solidity_keccak(["uint256", "uint256"], [int(owner, 16), slot])
+    return Web3.solidity_keccak(
+        ["uint256", "bytes32"],
+        [int(spender, 16), inner],
+    ).hex()
+
+
+def set_allowance(
+    w3: Web3,
+    token: str,
+    allowance_slot: int,
+    owner: str,
+    spender: str,
+    amount: int = MAX_UINT256,
+) -> None:
+    """Write *owner*'s allowance for *spender* straight into *token* storage.
+
+    Stands in for an ``approve`` transaction: no tx, no block, no receipt.
+    """
+    slot = _allowance_slot_key(owner, spender, allowance_slot)
+    w3.provider.make_request(
+        "anvil_setStorageAt", [token, slot, f"0x{amount:064x}"],
     )
-    value = "0x" + amount.to_bytes(32, "big").hex()
-    w3.provider.make_request("anvil_setStorageAt", [USDC, slot.hex(), value])
+
+
+def _fund_usdc_request(address: str, amount: int) -> tuple[str, list]:
+    slot = _balance_slot_key(address, USDC_BALANCE_SLOT)
+    return "anvil_setStorageAt", [USDC, slot, f"0x{amount:064x}"]
+
+
+def _fund_eth_request(address: str, wei: int) -> tuple[str, list]:
+    return "anvil_setBalance", [address, hex(wei)]
+
+
+def fund_usdc(w3: Web3, address: str, amount: int) -> None:
+    """Set *address*'s USDC balance to *amount* (6-decimal raw units)."""
+    w3.provider.make_request(*_fund_usdc_request(address, amount))
 
 
 def fund_token(w3: Web3, token: Token, address: str, amount: int) -> None:
     """Set *address*'s balance for any token with a known balance slot."""
-    slot = Web3.solidity_keccak(
-        ["uint256", "uint256"],
-        [int(address, 16), token.balance_slot],
+    slot = _balance_slot_key(address, token.balance_slot)
+    w3.provider.make_request(
+        "anvil_setStorageAt", [token.address, slot, f"0x{amount:064x}"],
     )
-    value = "0x" + amount.to_bytes(32, "big").hex()
-    w3.provider.make_request("anvil_setStorageAt", [token.address, slot.hex(), value])
 
 
 def fund_eth(w3: Web3, address: str, wei: int) -> None:
-    w3.provider.make_request("anvil_setBalance", [address, hex(wei)])
+    w3.provider.make_request(*_fund_eth_request(address, wei))
+
+
+def fund_account(w3: Web3, address: str, usdc: int, wei: int) -> None:
+    """Set *address*'s USDC and ETH balances in one batched round trip."""
+    rpc_batch(w3, [_fund_usdc_request(address, usdc), _fund_eth_request(address, wei)])
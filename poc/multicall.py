@@ -0,0 +1,61 @@
+"""Read-only calls aggregated through Multicall3.
+
+Multicall3 is deployed at the same address on mainnet (and so on any
+mainnet fork). ``aggregate3`` runs a list of calls inside one eth_call,
+so the node executes and answers them as a single request:
+
+    aggregate3((address target, bool allowFailure, bytes callData)[])
+        returns ((bool success, bytes returnData)[])
+"""
+
+from __future__ import annotations
+
+from eth_abi import decode, encode
+from web3 import Web3
+
+from .caveats import selector_for
+
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SIG = "aggregate3((address,bool,bytes)[])"
+_AGGREGATE3_SELECTOR = bytes.fromhex(selector_for(AGGREGATE3_SIG)[2:])
+
+
+def call_data(sig: str, args: bytes = b"") -> bytes:
+    """Calldata for *sig* with already ABI-encoded *args*."""
+    return bytes.fromhex(selector_for(sig)[2:]) + args
+
+
+def _encode_aggregate3(calls: list[tuple[str, bytes]]) -> bytes:
+    """aggregate3 calldata for *calls*, each allowed to fail."""
+    return _AGGREGATE3_SELECTOR + encode(
+        ["(address,bool,bytes)[]"],
+        [[(target, True, calldata) for target, calldata in calls]],
+    )
+
+
+def multicall_read(w3: Web3, calls: list[tuple[str, bytes]]) -> list[bytes]:
+    """Run *calls* in one eth_call and return each call's return data.
+
+    Parameters
+    ----------
+    w3 : Web3
+        Connected web3 instance (mainnet or a mainnet fork).
+    calls : list[tuple[str, bytes]]
+        ``(target, calldata)`` pairs, executed in order.
+
+    Returns
+    -------
+    list[bytes]
+        Raw ABI-encoded return data, one entry per call.
+
+    Raises
+    ------
+    RuntimeError
+        If any of the calls reverts.
+    """
+    raw = w3.eth.call({"to": MULTICALL3, "data": _encode_aggregate3(calls)})
+    (results,) = decode(["(bool,bytes)[]"], raw)
+    for (target, _), (success, _) in zip(calls, results):
+        if not success:
+            raise RuntimeError(f"multicall to {target} reverted")
+    return [return_data for _, return_data in results]
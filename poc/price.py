@@ -6,32 +6,73 @@ from web3 import Web3
 from .constants import (
     POOL_USDC_WETH_030, POOL_ABI,
     CHAINLINK_ETH_USD, CHAINLINK_ABI,
-    USDC, USDC_BALANCE_SLOT, SWAP_ROUTER_02,
-    ERC20_ABI, SWAP_ROUTER_ABI, POOL_FEE, WETH,
+    USDC, USDC_ALLOWANCE_SLOT, SWAP_ROUTER_02,
+    POOL_FEE, WETH, WETH_ALLOWANCE_SLOT,
 )
+from .contracts import exact_input_single_call, get_contract
+from .fork import fast_receipt, fund_eth, fund_usdc, set_allowance
+from .multicall import call_data, multicall_read
 
 
 # ---------------------------------------------------------------------------
 # Read prices
 # ---------------------------------------------------------------------------
 
+# Multicall3 calls for the aggregated readers. None of them takes
+# arguments, so the calldata is just the selector.
+_SLOT0_CALL = (POOL_USDC_WETH_030, call_data("slot0()"))
+_LIQUIDITY_CALL = (POOL_USDC_WETH_030, call_data("liquidity()"))
+_LATEST_ROUND_CALL = (CHAINLINK_ETH_USD, call_data("latestRoundData()"))
+
+
+_Q96 = 1 << 96
+_Q192 = 1 << 192
+
+
+def _pool_eth_price(sqrt_price_x96: int) -> float:
+    """ETH/USD implied by the pool's sqrtPriceX96.
+
+    The raw price is ``sqrtP**2 / 2**192`` WETH-wei per USDC unit, and
+    ETH/USD is ``1e12`` over that. Both steps fold into one exact integer
+    ratio, rounded to float once.
+    """
+    if not sqrt_price_x96:
+        return 0
+    return 10**12 * _Q192 / (sqrt_price_x96 * sqrt_price_x96)
+
+
+def _word(data: bytes, index: int, signed: bool = False) -> int:
+    """The *index*-th 32-byte word of ABI-encoded *data* as an integer."""
+    return int.from_bytes(data[index * 32 : (index + 1) * 32], "big", signed=signed)
+
+
 def read_pool_price(w3: Web3) -> tuple[int, float]:
     """Return (sqrtPriceX96, eth_price_usd) from the 0.3% pool."""
-    pool = w3.eth.contract(address=POOL_USDC_WETH_030, abi=POOL_ABI)
+    pool = get_contract(w3, POOL_USDC_WETH_030, POOL_ABI)
     slot0 = pool.functions.slot0().call()
     sqrt_price_x96 = slot0[0]
-    price_raw = (sqrt_price_x96 / (2**96)) ** 2
-    eth_price = (1 / price_raw) * (10**12) if price_raw else 0
-    return sqrt_price_x96, eth_price
+    return sqrt_price_x96, _pool_eth_price(sqrt_price_x96)
 
 
 def read_chainlink_price(w3: Web3) -> float:
     """Return ETH/USD from Chainlink (8-decimal)."""
-    oracle = w3.eth.contract(address=CHAINLINK_ETH_USD, abi=CHAINLINK_ABI)
+    oracle = get_contract(w3, CHAINLINK_ETH_USD, CHAINLINK_ABI)
     (_, answer, _, _, _) = oracle.functions.latestRoundData().call()
     return answer / 1e8
 
 
+def read_prices(w3: Web3) -> tuple[int, float, float]:
+    """Return (sqrtPriceX96, pool_eth_price, chainlink_eth_price).
+
+    Same values as ``read_pool_price`` and ``read_chainlink_price``, but
+    both reads run inside a single Multicall3 eth_call.
+    """
+    slot0, round_data = multicall_read(w3, [_SLOT0_CALL, _LATEST_ROUND_CALL])
+    sqrt_price_x96 = _word(slot0, 0)
+    answer = _word(round_data, 1, signed=True)
+    return sqrt_price_x96, _pool_eth_price(sqrt_price_x96), answer / 1e8
+
+
 # ---------------------------------------------------------------------------
 # Manipulate price via large swap (realistic approach)
 # ---------------------------------------------------------------------------
@@ -39,95 +80,118 @@ def read_chainlink_price(w3: Web3) -> float:
 def _target_sqrt_price_x96(eth_price_usd: float) -> int:
     """Compute sqrtPriceX96 for a target ETH/USD price.
 
-    In the USDC/WETH pool token0=USDC, token1=WETH so
-    price = token1/token0 = 1 / (eth_price * 1e12).
+    In the USDC/WETH pool token0=USDC, token1=WETH so, in raw units,
+    price = token1/token0 = 1e12 / eth_price (WETH has 12 more decimals).
+    This is the inverse of the conversion in ``read_pool_price``.
     """
-    price = 1.0 / (eth_price_usd * 1e12)
-    return int(math.sqrt(price) * (2**96))
+    # sqrt(1e12 / p * 2**192) in integers, with p in micro-dollars:
+    # no float sqrt and no underflow for any price.
+    eth_price_micro = round(eth_price_usd * 1e6)
+    return math.isqrt(10**18 * _Q192 // eth_price_micro)
+
+
+# The closed-form amount assumes the liquidity at the current tick holds
+# all the way to the target. Ticks crossed on the way can hold less, so
+# fund extra; sqrtPriceLimitX96 stops the swap at the target regardless.
+_SWAP_HEADROOM = 2
+
+
+def _amount_in_to_reach(
+    sqrt_price_x96: int, target_sqrt_x96: int, liquidity: int, fee: int,
+) -> int:
+    """Input amount (raw units, fee included) moving the pool to the target.
+
+    Uniswap V3 within a single liquidity range L:
+      token0 in (price falls):  dx = L * (1/sqrtP_target - 1/sqrtP)
+      token1 in (price rises):  dy = L * (sqrtP_target - sqrtP)
+    with prices in Q64.96. The fee is taken from the input, so the result
+    is grossed up by 1 / (1 - fee / 1e6).
+    """
+    if target_sqrt_x96 < sqrt_price_x96:
+        num = liquidity * _Q96 * (sqrt_price_x96 - target_sqrt_x96)
+        den = sqrt_price_x96 * target_sqrt_x96
+    else:
+        num = liquidity * (target_sqrt_x96 - sqrt_price_x96)
+        den = _Q96
+    net = -(-num // den)  # round up
+    return -(-net * 1_000_000 // (1_000_000 - fee))
 
 
 def move_pool_price(w3: Web3, target_eth_usd: float, sender: str) -> float:
     """Push the pool price toward *target_eth_usd* by executing a large swap.
 
+    The swap size is solved from the pool's current sqrtPriceX96 and
+    liquidity, and the swap is limited to the target sqrtPriceX96, so a
+    single swap replaces swap-and-poll iterations.
+
     Returns the resulting ETH price after the move.
     """
-    _, current_price = read_pool_price(w3)
+    slot0, liquidity = multicall_read(w3, [_SLOT0_CALL, _LIQUIDITY_CALL])
+    sqrt_price_x96 = _word(slot0, 0)
+    liquidity = _word(liquidity, 0)
+    current_price = _pool_eth_price(sqrt_price_x96)
 
     if abs(current_price - target_eth_usd) / current_price < 0.001:
         return current_price  # already close enough
 
+    target_sqrt = _target_sqrt_price_x96(target_eth_usd)
+    amount_in = _SWAP_HEADROOM * _amount_in_to_reach(
+        sqrt_price_x96, target_sqrt, liquidity, POOL_FEE,
+    )
     if target_eth_usd > current_price:
         # Need to buy WETH (sell USDC) -> price goes up
-        _push_price_up(w3, sender, target_eth_usd)
+        _push_price_up(w3, sender, amount_in, target_sqrt)
     else:
         # Need to sell WETH (buy USDC) -> price goes down
-        _push_price_down(w3, sender, target_eth_usd)
+        _push_price_down(w3, sender, amount_in, target_sqrt)
 
     _, new_price = read_pool_price(w3)
     return new_price
 
 
-def _push_price_up(w3: Web3, sender: str, target: float) -> None:
-    """Buy WETH with USDC to push price up."""
-    usdc = w3.eth.contract(address=USDC, abi=ERC20_ABI)
-    router = w3.eth.contract(address=SWAP_ROUTER_02, abi=SWAP_ROUTER_ABI)
-
-    for _ in range(10):
-        _, price = read_pool_price(w3)
-        if price >= target * 0.999:
-            return
-        # Swap a chunk of USDC -> WETH
-        chunk = int(5_000_000 * 1e6)  # 5M USDC per iteration
-        from .fork import fund_usdc
-        fund_usdc(w3, sender, chunk)
-
-        usdc.functions.approve(SWAP_ROUTER_02, chunk).transact({"from": sender})
-        w3.eth.wait_for_transaction_receipt(
-            router.functions.exactInputSingle({
-                "tokenIn": USDC,
-                "tokenOut": WETH,
-                "fee": POOL_FEE,
-                "recipient": sender,
-                "amountIn": chunk,
-                "amountOutMinimum": 0,
-                "sqrtPriceLimitX96": 0,
-            }).transact({"from": sender})
-        )
-
-
-def _push_price_down(w3: Web3, sender: str, target: float) -> None:
-    """Sell WETH for USDC to push price down."""
-    from .fork import fund_usdc
-    weth = w3.eth.contract(address=WETH, abi=ERC20_ABI)
-    router = w3.eth.contract(address=SWAP_ROUTER_02, abi=SWAP_ROUTER_ABI)
-
-    for _ in range(10):
-        _, price = read_pool_price(w3)
-        if price <= target * 1.001:
-            return
-        # Deposit ETH -> WETH then swap WETH -> USDC
-        chunk_wei = int(2000 * 1e18)  # 2000 WETH per iteration
-        from .fork import fund_eth
-        fund_eth(w3, sender, chunk_wei * 2)
-
-        # Wrap ETH -> WETH via deposit
-        w3.eth.send_transaction({
-            "from": sender,
-            "to": WETH,
-            "value": chunk_wei,
-        })
-        weth.functions.approve(SWAP_ROUTER_02, chunk_wei).transact({"from": sender})
-        w3.eth.wait_for_transaction_receipt(
-            router.functions.exactInputSingle({
-                "tokenIn": WETH,
-                "tokenOut": USDC,
-                "fee": POOL_FEE,
-                "recipient": sender,
-                "amountIn": chunk_wei,
-                "amountOutMinimum": 0,
-                "sqrtPriceLimitX96": 0,
-            }).transact({"from": sender})
-        )
+def _push_price_up(w3: Web3, sender: str, amount_in: int, limit_sqrt: int) -> None:
+    """Buy WETH with up to *amount_in* USDC, stopping at *limit_sqrt*."""
+    # Balance and router allowance are written to storage, so the swap
+    # is the only transaction.
+    fund_usdc(w3, sender, amount_in)
+    set_allowance(w3, USDC, USDC_ALLOWANCE_SLOT, sender, SWAP_ROUTER_02)
+    tx = w3.eth.send_transaction({
+        **exact_input_single_call(
+            USDC, WETH, POOL_FEE, sender, amount_in, limit_sqrt,
+        ),
+        "from": sender,
+    })
+    receipt = fast_receipt(w3, tx)
+    assert receipt["status"] == 1, "Price-push swap (USDC -> WETH) reverted"
+
+
+def _push_price_down(w3: Web3, sender: str, amount_in: int, limit_sqrt: int) -> None:
+    """Sell up to *amount_in* WETH for USDC, stopping at *limit_sqrt*."""
+    # Deposit ETH -> WETH (leaving ETH for gas) then swap WETH -> USDC.
+    # The router allowance is written to storage; the deposit and swap
+    # are pipelined with explicit nonces.
+    fund_eth(w3, sender, amount_in * 2)
+    set_allowance(w3, WETH, WETH_ALLOWANCE_SLOT, sender, SWAP_ROUTER_02)
+    nonce = w3.eth.get_transaction_count(sender)
+    deposit_tx = w3.eth.send_transaction({
+        "from": sender,
+        "to": WETH,
+        "value": amount_in,
+        "nonce": nonce,
+    })
+    tx = w3.eth.send_transaction({
+        **exact_input_single_call(
+            WETH, USDC, POOL_FEE, sender, amount_in, limit_sqrt,
+        ),
+        "from": sender,
+        "nonce": nonce + 1,
+    })
+    receipt = fast_receipt(w3, tx)
+    # The deposit was mined before the swap, so one non-polling read gets
+    # its receipt; check it first so a failed deposit is reported as such.
+    deposit = w3.eth.get_transaction_receipt(deposit_tx)
+    assert deposit["status"] == 1, "WETH deposit reverted"
+    assert receipt["status"] == 1, "Price-push swap (WETH -> USDC) reverted"
 
 
 # ---------------------------------------------------------------------------
@@ -6,37 +6,53 @@ from web3 import Web3
 
 from .constants import (
     USDC, WETH, SWAP_ROUTER_02, POOL_FEE,
-    ERC20_ABI, SWAP_ROUTER_ABI, SwapPair,
+    ERC20_ABI, SwapPair,
 )
+from .contracts import approve_call, exact_input_single_call, get_contract
+from .fork import fast_receipt
 
 
 def approve_usdc(w3: Web3, sender: str, amount: int) -> None:
-    usdc = w3.eth.contract(address=USDC, abi=ERC20_ABI)
-    tx = usdc.functions.approve(SWAP_ROUTER_02, amount).transact({"from": sender})
-    w3.eth.wait_for_transaction_receipt(tx)
+    tx = w3.eth.send_transaction(
+        {**approve_call(USDC, SWAP_ROUTER_02, amount), "from": sender}
+    )
+    fast_receipt(w3, tx)
+
+
+def _check_approved(w3: Web3, approve_tx) -> None:
+    """Fail if the pipelined approve reverted.
+
+    Its receipt is never awaited, so without this a failed approve (e.g.
+    USDT refusing a non-zero to non-zero allowance change) would surface
+    as a misleading "Swap reverted". The swap is already mined, so the
+    approve receipt is there and one read suffices.
+    """
+    receipt = w3.eth.get_transaction_receipt(approve_tx)
+    assert receipt["status"] == 1, "Approve reverted"
 
 
 def swap_usdc_to_weth(w3: Web3, sender: str, amount_usdc: int) -> int:
     """Swap *amount_usdc* (6-decimal raw) for WETH. Returns amountOut in wei."""
-    approve_usdc(w3, sender, amount_usdc)
-
-    router = w3.eth.contract(address=SWAP_ROUTER_02, abi=SWAP_ROUTER_ABI)
-    params = {
-        "tokenIn": USDC,
-        "tokenOut": WETH,
-        "fee": POOL_FEE,
-        "recipient": sender,
-        "amountIn": amount_usdc,
-        "amountOutMinimum": 0,
-        "sqrtPriceLimitX96": 0,
-    }
-
-    tx = router.functions.exactInputSingle(params).transact({"from": sender})
-    receipt = w3.eth.wait_for_transaction_receipt(tx)
+    # approve and swap go out back to back with explicit nonces; only the
+    # swap receipt is awaited, since it cannot be mined before the approve.
+    nonce = w3.eth.get_transaction_count(sender)
+    approve_tx = w3.eth.send_transaction({
+        **approve_call(USDC, SWAP_ROUTER_02, amount_usdc),
+        "from": sender,
+        "nonce": nonce,
+    })
+
+    tx = w3.eth.send_transaction({
+        **exact_input_single_call(USDC, WETH, POOL_FEE, sender, amount_usdc),
+        "from": sender,
+        "nonce": nonce + 1,
+    })
+    receipt = fast_receipt(w3, tx)
+    _check_approved(w3, approve_tx)
     assert receipt["status"] == 1, "Swap reverted"
 
     # Read WETH balance to determine output
-    weth = w3.eth.contract(address=WETH, abi=ERC20_ABI)
+    weth = get_contract(w3, WETH, ERC20_ABI)
     return weth.functions.balanceOf(sender).call()
 
 
@@ -59,24 +75,24 @@ def swap(w3: Web3, sender: str, pair: SwapPair, amount_in: int) -> int:
     int
         Balance of output token after the swap (in raw units).
     """
-    token_in = w3.eth.contract(address=pair.token_in.address, abi=ERC20_ABI)
-    tx = token_in.functions.approve(SWAP_ROUTER_02, amount_in).transact(
-        {"from": sender}
-    )
-    w3.eth.wait_for_transaction_receipt(tx)
-
-    router = w3.eth.contract(address=SWAP_ROUTER_02, abi=SWAP_ROUTER_ABI)
-    tx = router.functions.exactInputSingle({
-        "tokenIn": pair.token_in.address,
-        "tokenOut": pair.token_out.address,
-        "fee": pair.fee,
-        "recipient": sender,
-        "amountIn": amount_in,
-        "amountOutMinimum": 0,
-        "sqrtPriceLimitX96": 0,
-    }).transact({"from": sender})
-    receipt = w3.eth.wait_for_transaction_receipt(tx)
+    nonce = w3.eth.get_transaction_count(sender)
+    approve_tx = w3.eth.send_transaction({
+        **approve_call(pair.token_in.address, SWAP_ROUTER_02, amount_in),
+        "from": sender,
+        "nonce": nonce,
+    })
+
+    tx = w3.eth.send_transaction({
+        **exact_input_single_call(
+            pair.token_in.address, pair.token_out.address, pair.fee,
+            sender, amount_in,
+        ),
+        "from": sender,
+        "nonce": nonce + 1,
+    })
+    receipt = fast_receipt(w3, tx)
+    _check_approved(w3, approve_tx)
     assert receipt["status"] == 1, "Swap reverted"
 
-    token_out = w3.eth.contract(address=pair.token_out.address, abi=ERC20_ABI)
+    token_out = get_contract(w3, pair.token_out.address, ERC20_ABI)
     return token_out.functions.balanceOf(sender).call()
@@ -0,0 +1,14 @@
+"""Reference 4-byte selectors for the tests.
+
+Well-known ERC-20 selectors are literals. The exactInputSingle selector
+is hashed once per session with ``Web3.keccak`` rather than
+``poc.caveats.selector_for``, so the selector tests compare against an
+independent implementation.
+"""
+
+from web3 import Web3
+
+EXPECTED_EXACT_INPUT_SINGLE = Web3.keccak(
+    text="exactInputSingle((address,address,uint24,address,uint256,uint256,uint160))"
+)[:4].hex()
+TRANSFER_SELECTOR = "0xa9059cbb"  # transfer(address,uint256)
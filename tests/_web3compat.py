@@ -0,0 +1,11 @@
+"""web3 version shims shared by the unit tests."""
+
+
+def encode_abi(contract, fn_name: str, args) -> str:
+    """Hex calldata for ``contract.<fn_name>(*args)`` as web3 encodes it.
+
+    ``Contract.encode_abi`` replaced ``encodeABI`` late in web3 6.x; use
+    whichever this web3 has.
+    """
+    encode = getattr(contract, "encode_abi", None) or contract.encodeABI
+    return encode(fn_name, args)
@@ -2,16 +2,32 @@
 
 Provides Anvil lifecycle management and web3 connections for both
 local-only tests (no fork) and mainnet fork tests.
+
+The anvil fixtures are session-scoped and bind an OS-assigned port, so
+under pytest-xdist (``pytest -n auto``) every worker starts, reuses and
+tears down its own anvil and the workers run in parallel. The local-EVM
+modules are marked ``xdist_group("anvil_local")``; with ``--dist loadgroup``
+they all run on one worker, so only that worker pays the anvil start-up
+while the unit tests spread over the rest.
 """
 
+import hashlib
 import os
 import shutil
-import signal
-import subprocess
-import time
+from functools import lru_cache
 
 import pytest
-from web3 import Web3
+
+from poc.enforcers import _Assembler, _runtime_hex, deploy_enforcers
+from poc.fork import connect, launch_anvil, stop_anvil
+
+
+def pytest_configure(config):
+    # Registered by pytest-xdist too; declared here so the marker is known
+    # when the suite runs without it.
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run these tests on one xdist worker",
+    )
 
 
 def _anvil_available() -> bool:
@@ -19,6 +35,13 @@ def _anvil_available() -> bool:
     return shutil.which("anvil") is not None
 
 
+def _reverted(w3):
+    """Yield *w3*, then revert its chain to the state before the yield."""
+    snapshot_id = w3.provider.make_request("evm_snapshot", [])["result"]
+    yield w3
+    w3.provider.make_request("evm_revert", [snapshot_id])
+
+
 def _find_free_port() -> int:
     """Return a free TCP port (OS-assigned)."""
     import socket
@@ -27,34 +50,6 @@ def _find_free_port() -> int:
         return s.getsockname()[1]
 
 
-def _start_anvil(args: list[str], port: int, timeout: float = 15.0) -> subprocess.Popen:
-    """Start anvil with *args* on *port* and wait until the RPC is reachable."""
-    proc = subprocess.Popen(
-        ["anvil", "--port", str(port), "--silent"] + args,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
-    w3 = Web3(Web3.HTTPProvider(f"http://127.0.0.1:{port}"))
-    deadline = time.monotonic() + timeout
-    while time.monotonic() < deadline:
-        try:
-            if w3.is_connected():
-                return proc
-        except Exception:
-            pass
-        time.sleep(0.2)
-    proc.kill()
-    raise RuntimeError(f"Anvil failed to start on port {port}")
-
-
-def _stop_anvil(proc: subprocess.Popen) -> None:
-    proc.send_signal(signal.SIGTERM)
-    try:
-        proc.wait(timeout=5)
-    except subprocess.TimeoutExpired:
-        proc.kill()
-
-
 # ---------------------------------------------------------------------------
 # Local Anvil (no fork) — fast, deterministic
 # ---------------------------------------------------------------------------
@@ -68,10 +63,163 @@ def anvil_local():
     if not _anvil_available():
         pytest.skip("anvil not found on PATH — install Foundry")
     port = _find_free_port()
-    proc = _start_anvil([], port)
-    w3 = Web3(Web3.HTTPProvider(f"http://127.0.0.1:{port}"))
+    proc = launch_anvil([], port, timeout=15.0)
+    w3 = connect(port)
     yield w3, port
-    _stop_anvil(proc)
+    stop_anvil(proc)
+
+
+@pytest.fixture(scope="session")
+def w3(anvil_local):
+    """Local web3 instance (no mainnet fork).
+
+    Fork modules override ``w3`` and ``sender`` with their own fixtures.
+    """
+    w3_instance, _ = anvil_local
+    return w3_instance
+
+
+@pytest.fixture(scope="session")
+def sender(w3):
+    return w3.eth.accounts[0]
+
+
+@pytest.fixture(scope="session")
+def delegator(w3):
+    return w3.eth.accounts[1]
+
+
+@pytest.fixture(scope="session")
+def delegatee(w3):
+    return w3.eth.accounts[2]
+
+
+@lru_cache(maxsize=None)
+def build_dispatch_runtime(table: tuple[tuple[int, int], ...]) -> str:
+    """Runtime hex for a mock that returns a fixed uint256 per selector.
+
+    *table* holds ``(selector, return_value)`` pairs; any other selector
+    reverts. Mocks of the same shape share one cached runtime.
+    """
+    asm = _Assembler()
+    asm.push(0x00)
+    asm.op("CALLDATALOAD")
+    asm.push(0xe0)
+    asm.op("SHR")
+    for i, (selector, _) in enumerate(table):
+        asm.op("DUP1")
+        asm.push(selector, size=4)
+        asm.op("EQ")
+        asm.push_label(f"case_{i}")
+        asm.op("JUMPI")
+    asm.push(0x00)
+    asm.op("DUP1", "REVERT")
+    for i, (_, value) in enumerate(table):
+        asm.label(f"case_{i}")
+        asm.push(value, size=max(1, (value.bit_length() + 7) // 8))
+        asm.push(0x00)
+        asm.op("MSTORE")
+        asm.push(0x20)
+        asm.push(0x00)
+        asm.op("RETURN")
+    return asm.hex()
+
+
+# Minimal ERC-20: approve() returns true, balanceOf() returns 0
+MOCK_ERC20_TABLE = ((0x095ea7b3, 1), (0x70a08231, 0))
+
+
+def _load_cached_state(w3, entry) -> dict[str, str] | None:
+    """Load a cached anvil state dump; return its addresses, or None.
+
+    An error reply (a stale or corrupt dump, or an anvil without
+    ``anvil_loadState``) means "redeploy"; transport failures propagate.
+    Called from ``deployed_contracts``, which ``fresh_local`` depends on,
+    so the load always lands before the first per-test snapshot.
+    """
+    loaded = w3.provider.make_request("anvil_loadState", [entry["state"]])
+    if "error" in loaded:
+        return None
+    addresses = entry["addresses"]
+    if not loaded.get("result") or not all(
+        len(w3.eth.get_code(a)) > 0 for a in addresses.values()
+    ):
+        return None
+    return addresses
+
+
+@pytest.fixture(scope="session")
+def deployed_contracts(w3, sender, pytestconfig):
+    """Addresses of the fixed enforcers and the mock ERC-20, by name.
+
+    All four are deployed together through one batched send and one
+    batched receipt read. None of them keeps storage the tests change, so
+    one deployment per session serves every local-EVM module.
+
+    The resulting anvil state (``anvil_dumpState``) and addresses are kept
+    in the pytest cache under a key hashed from the runtimes, and later
+    runs load that state instead of deploying. Changing any runtime
+    changes the key; ``pytest --cache-clear`` drops it.
+    """
+    runtimes = {
+        "allowed_targets": _runtime_hex("allowed_targets"),
+        "allowed_methods": _runtime_hex("allowed_methods"),
+        "value_limit": _runtime_hex("value_limit"),
+        "mock_erc20": build_dispatch_runtime(MOCK_ERC20_TABLE),
+    }
+    digest = hashlib.sha256("".join(runtimes.values()).encode()).hexdigest()
+    key = f"ethbox/anvil_state/{digest[:16]}"
+    entry = pytestconfig.cache.get(key, None)
+    if entry is not None:
+        addresses = _load_cached_state(w3, entry)
+        if addresses is not None:
+            return addresses
+
+    addresses = dict(zip(
+        runtimes, deploy_enforcers(w3, sender, list(runtimes.values())),
+    ))
+    dump = w3.provider.make_request("anvil_dumpState", [])
+    if "result" in dump:
+        pytestconfig.cache.set(key, {"state": dump["result"], "addresses": addresses})
+    return addresses
+
+
+@pytest.fixture(scope="session")
+def targets_enforcer(deployed_contracts):
+    """AllowedTargetsEnforcer address."""
+    return deployed_contracts["allowed_targets"]
+
+
+@pytest.fixture(scope="session")
+def methods_enforcer(deployed_contracts):
+    """AllowedMethodsEnforcer address."""
+    return deployed_contracts["allowed_methods"]
+
+
+@pytest.fixture(scope="session")
+def value_enforcer(deployed_contracts):
+    """ValueLimitEnforcer address."""
+    return deployed_contracts["value_limit"]
+
+
+@pytest.fixture(scope="session")
+def mock_erc20(deployed_contracts):
+    """Mock ERC-20 address (see MOCK_ERC20_TABLE)."""
+    return deployed_contracts["mock_erc20"]
+
+
+@pytest.fixture
+def fresh_local(anvil_local, deployed_contracts):
+    """The local web3 instance, with its state reverted after each test.
+
+    Same snapshot/revert as ``fresh_fork``. Contracts deployed by session-
+    and module-scoped fixtures exist before the snapshot and survive it.
+    ``deployed_contracts`` is requested here, not left to the test, so the
+    shared deployment (or cached-state load) always happens before the
+    first snapshot — even for tests that only reach the enforcers through
+    ``request.getfixturevalue``.
+    """
+    yield from _reverted(anvil_local[0])
 
 
 # ---------------------------------------------------------------------------
@@ -88,6 +236,10 @@ def anvil_fork():
     Requires the RPC_URL environment variable. Tests using this fixture
     are marked as integration tests and are skipped if RPC_URL is not set.
 
+    Under pytest-xdist each worker gets its own fork on its own port, so
+    the fork tests overlap their RPC round trips. Every fork warms its own
+    cache from RPC_URL; keep the worker count modest.
+
     Yields (web3_instance, port).
     """
     if not _anvil_available():
@@ -96,10 +248,27 @@ def anvil_fork():
     if not rpc_url:
         pytest.skip("RPC_URL not set — skipping mainnet fork tests")
     port = _find_free_port()
-    proc = _start_anvil(
-        ["--fork-url", rpc_url, "--fork-block-number", str(DEFAULT_FORK_BLOCK)],
+    proc = launch_anvil(
+        [
+            "--fork-url", rpc_url,
+            "--fork-block-number", str(DEFAULT_FORK_BLOCK),
+            # Parallel workers each fork from the same upstream RPC
+            "--no-rate-limit",
+        ],
         port,
+        timeout=15.0,
     )
-    w3 = Web3(Web3.HTTPProvider(f"http://127.0.0.1:{port}"))
+    w3 = connect(port)
     yield w3, port
-    _stop_anvil(proc)
+    stop_anvil(proc)
+
+
+@pytest.fixture
+def fresh_fork(anvil_fork):
+    """The forked web3 instance, with its state reverted after each test.
+
+    Takes an ``evm_snapshot`` before the test and ``evm_revert``s to it
+    afterwards, so tests that mutate the fork share one anvil process
+    instead of needing a pristine one each.
+    """
+    yield from _reverted(anvil_fork[0])
@@ -5,15 +5,28 @@ structure without any EVM interaction. They catch regressions in the
 static dict shape, selectors, and address references.
 """
 
+from types import MappingProxyType
+
 from web3 import Web3
 
+import pytest
+
 from poc.caveats import (
     usdc_weth_swap_caveats,
+    Caveats,
+    print_caveats,
     APPROVE_SELECTOR,
+    APPROVE_SIG,
     EXACT_INPUT_SINGLE_SELECTOR,
+    EXACT_INPUT_SINGLE_SIG,
+    SELECTORS,
+    TRANSFER_SIG,
+    selector_for,
 )
 from poc.constants import USDC, WETH, SWAP_ROUTER_02, POOL_FEE
 
+from tests._selectors import EXPECTED_EXACT_INPUT_SINGLE
+
 
 # ---------------------------------------------------------------------------
 # Selector correctness
@@ -21,16 +34,37 @@ from poc.constants import USDC, WETH, SWAP_ROUTER_02, POOL_FEE
 
 def test_approve_selector_matches_erc20():
     """approve(address,uint256) selector must be 0x095ea7b3."""
-    expected = Web3.keccak(text="approve(address,uint256)")[:4].hex()
-    assert APPROVE_SELECTOR == expected
     assert APPROVE_SELECTOR == "0x095ea7b3"
 
 
 def test_exact_input_single_selector():
     """exactInputSingle((...)) selector must match the SwapRouter02 ABI."""
-    sig = "exactInputSingle((address,address,uint24,address,uint256,uint256,uint160))"
-    expected = Web3.keccak(text=sig)[:4].hex()
-    assert EXACT_INPUT_SINGLE_SELECTOR == expected
+    assert EXACT_INPUT_SINGLE_SELECTOR == EXPECTED_EXACT_INPUT_SINGLE
+
+
+def test_selectors_map_keyed_by_signature():
+    assert SELECTORS[APPROVE_SIG] == APPROVE_SELECTOR
+    assert SELECTORS[EXACT_INPUT_SINGLE_SIG] == EXACT_INPUT_SINGLE_SELECTOR
+
+
+def test_selectors_map_is_read_only():
+    with pytest.raises(TypeError):
+        SELECTORS["transfer(address,uint256)"] = "0xa9059cbb"
+
+
+def test_lazy_selector_attributes():
+    import poc.caveats as caveats
+
+    assert caveats.__getattr__("APPROVE_SELECTOR") == APPROVE_SELECTOR
+    assert caveats.APPROVE_SELECTOR is vars(caveats)["APPROVE_SELECTOR"]
+    with pytest.raises(AttributeError):
+        caveats.NOT_A_SELECTOR
+
+
+def test_selector_for_matches_web3():
+    assert selector_for(TRANSFER_SIG) == SELECTORS[TRANSFER_SIG] == "0xa9059cbb"
+    sig = "balanceOf(address)"
+    assert selector_for(sig) == Web3.keccak(text=sig)[:4].hex()
 
 
 # ---------------------------------------------------------------------------
@@ -41,12 +75,19 @@ SENDER = "0x000000000000000000000000000000000000dEaD"
 MAX_USDC = 10_000 * 10**6  # 10k USDC in raw units
 
 
-def _caveats():
-    return usdc_weth_swap_caveats(max_usdc=MAX_USDC, recipient=SENDER)
+@pytest.fixture(scope="module")
+def caveats():
+    """The MAX_USDC/SENDER caveat map, built once and shared read-only.
 
+    Tests that need a map they can mutate call usdc_weth_swap_caveats()
+    themselves.
+    """
+    return MappingProxyType(
+        usdc_weth_swap_caveats(max_usdc=MAX_USDC, recipient=SENDER)
+    )
 
-def test_returns_all_required_keys():
-    caveats = _caveats()
+
+def test_returns_all_required_keys(caveats):
     assert set(caveats.keys()) == {
         "AllowedTargets",
         "AllowedMethods",
@@ -55,33 +96,34 @@ def test_returns_all_required_keys():
     }
 
 
-def test_allowed_targets_contains_usdc_and_router():
-    targets = _caveats()["AllowedTargets"]
-    assert USDC in targets
-    assert SWAP_ROUTER_02 in targets
-    assert len(targets) == 2
-
-
-def test_allowed_targets_does_not_include_pool():
+@pytest.mark.parametrize("path,expected", [
+    (("AllowedTargets",), [USDC, SWAP_ROUTER_02]),
+    (("AllowedMethods",), [APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR]),
+    (("ERC20TransferAmount", "token"), USDC),
+    (("ERC20TransferAmount", "maxAmount"), MAX_USDC),
+    (("SwapConstraints", "tokenIn"), USDC),
+    (("SwapConstraints", "tokenOut"), WETH),
+    (("SwapConstraints", "fee"), POOL_FEE),
+    (("SwapConstraints", "recipient"), SENDER),
+])
+def test_caveat_shape(caveats, path, expected):
+    """Each caveat entry holds the value built from the inputs."""
+    value = caveats
+    for key in path:
+        value = value[key]
+    if isinstance(expected, list):
+        # Order-insensitive, but duplicates still count
+        value, expected = sorted(value), sorted(expected)
+    assert value == expected
+
+
+def test_allowed_targets_does_not_include_pool(caveats):
     """The pool is called internally by the router, not by the delegatee."""
     from poc.constants import POOL_USDC_WETH_030
-    targets = _caveats()["AllowedTargets"]
+    targets = caveats["AllowedTargets"]
     assert POOL_USDC_WETH_030 not in targets
 
 
-def test_allowed_methods_contains_both_selectors():
-    methods = _caveats()["AllowedMethods"]
-    assert APPROVE_SELECTOR in methods
-    assert EXACT_INPUT_SINGLE_SELECTOR in methods
-    assert len(methods) == 2
-
-
-def test_erc20_transfer_amount_cap():
-    cap = _caveats()["ERC20TransferAmount"]
-    assert cap["token"] == USDC
-    assert cap["maxAmount"] == MAX_USDC
-
-
 def test_erc20_transfer_amount_respects_input():
     """Cap should reflect the max_usdc argument, not a hardcoded value."""
     small = usdc_weth_swap_caveats(max_usdc=100, recipient=SENDER)
@@ -90,14 +132,6 @@ def test_erc20_transfer_amount_respects_input():
     assert large["ERC20TransferAmount"]["maxAmount"] == 999_999
 
 
-def test_swap_constraints():
-    sc = _caveats()["SwapConstraints"]
-    assert sc["tokenIn"] == USDC
-    assert sc["tokenOut"] == WETH
-    assert sc["fee"] == POOL_FEE
-    assert sc["recipient"] == SENDER
-
-
 def test_swap_constraints_recipient_matches_input():
     other = "0x0000000000000000000000000000000000001234"
     caveats = usdc_weth_swap_caveats(max_usdc=MAX_USDC, recipient=other)
@@ -113,3 +147,45 @@ def test_independent_calls_do_not_share_state():
     b = usdc_weth_swap_caveats(max_usdc=200, recipient=SENDER)
     assert a["ERC20TransferAmount"]["maxAmount"] == 100
     assert b["ERC20TransferAmount"]["maxAmount"] == 200
+
+
+def test_mutating_result_does_not_leak_into_later_calls():
+    a = usdc_weth_swap_caveats(max_usdc=100, recipient=SENDER)
+    a["AllowedTargets"].append(WETH)
+    a["SwapConstraints"]["fee"] = 500
+    b = usdc_weth_swap_caveats(max_usdc=100, recipient=SENDER)
+    assert b["AllowedTargets"] == [USDC, SWAP_ROUTER_02]
+    assert b["SwapConstraints"]["fee"] == POOL_FEE
+
+
+# ---------------------------------------------------------------------------
+# Typed Caveats form
+# ---------------------------------------------------------------------------
+
+def test_caveats_round_trips_through_dict(caveats):
+    typed = Caveats.from_map(caveats)
+    assert typed.cap == MAX_USDC
+    assert typed.token_out == WETH
+    assert typed.to_dict() == dict(caveats)
+
+
+def test_caveats_is_frozen_and_slotted(caveats):
+    typed = Caveats.from_map(caveats)
+    assert not hasattr(typed, "__dict__")
+    with pytest.raises(AttributeError):
+        typed.cap = 0
+
+
+# ---------------------------------------------------------------------------
+# Display
+# ---------------------------------------------------------------------------
+
+def test_print_caveats_output(capsys):
+    print_caveats({"AllowedTargets": [USDC], "ERC20TransferAmount": {"maxAmount": 5}})
+    assert capsys.readouterr().out == (
+        "\n--- Caveat Resolution Map ---\n"
+        f"  AllowedTargets: [{USDC}]\n"
+        "  ERC20TransferAmount:\n"
+        "    maxAmount: 5\n"
+        "\n"
+    )
@@ -0,0 +1,65 @@
+"""Unit tests for cached contract handles and pre-encoded calldata.
+
+These tests validate:
+  - get_contract() builds each (web3, address, ABI) handle once
+  - approve / exactInputSingle calldata matches web3's ABI encoding
+"""
+
+import gc
+import weakref
+
+from web3 import Web3
+
+from poc.constants import (
+    ERC20_ABI, POOL_ABI, POOL_FEE, POOL_USDC_WETH_030,
+    SWAP_ROUTER_02, SWAP_ROUTER_ABI, USDC, WETH,
+)
+from poc.contracts import (
+    _contract, approve_call, exact_input_single_call, get_contract,
+)
+
+from tests._web3compat import encode_abi
+
+SENDER = "0x000000000000000000000000000000000000dEaD"
+
+
+def test_get_contract_is_cached_per_web3():
+    w3 = Web3()
+    usdc = get_contract(w3, USDC, ERC20_ABI)
+    assert get_contract(w3, USDC, ERC20_ABI) is usdc
+    assert get_contract(w3, POOL_USDC_WETH_030, POOL_ABI) is not usdc
+    assert get_contract(Web3(), USDC, ERC20_ABI) is not usdc
+
+
+def test_contract_cache_releases_throwaway_web3s():
+    w3 = Web3()
+    get_contract(w3, USDC, ERC20_ABI)
+    ref = weakref.ref(w3)
+    del w3
+    for _ in range(_contract.cache_info().maxsize):
+        get_contract(Web3(), USDC, ERC20_ABI)
+    gc.collect()
+    assert ref() is None
+
+
+def test_approve_call_matches_web3():
+    usdc = Web3().eth.contract(address=USDC, abi=ERC20_ABI)
+    tx = approve_call(USDC, SWAP_ROUTER_02, 10_000 * 10**6)
+    assert tx["to"] == USDC
+    assert tx["data"] == encode_abi(usdc, "approve", [SWAP_ROUTER_02, 10_000 * 10**6])
+
+
+def test_exact_input_single_call_matches_web3():
+    router = Web3().eth.contract(address=SWAP_ROUTER_02, abi=SWAP_ROUTER_ABI)
+    params = {
+        "tokenIn": USDC,
+        "tokenOut": WETH,
+        "fee": POOL_FEE,
+        "recipient": SENDER,
+        "amountIn": 10**9,
+        "amountOutMinimum": 0,
+        "sqrtPriceLimitX96": 2**96,
+    }
+    tx = exact_input_single_call(USDC, WETH, POOL_FEE, SENDER, 10**9, 2**96)
+    assert tx["to"] == SWAP_ROUTER_02
+    assert tx["data"] == encode_abi(router, "exactInputSingle", [params])
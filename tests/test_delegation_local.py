@@ -11,16 +11,21 @@ instance and verify that:
 Requires: Foundry (anvil) on PATH.
 """
 
+from dataclasses import replace
+
 import pytest
-from web3 import Web3
+from web3.exceptions import ContractLogicError
 
 from poc.enforcers import (
-    deploy_allowed_targets_enforcer,
-    deploy_allowed_methods_enforcer,
-    deploy_value_limit_enforcer,
     call_allowed_targets_enforcer,
     call_allowed_methods_enforcer,
     call_value_limit_enforcer,
+    deploy_specialized_allowed_targets_enforcer,
+    deploy_specialized_allowed_methods_enforcer,
+    call_specialized_allowed_targets_enforcer,
+    call_specialized_allowed_methods_enforcer,
+    deploy_combined_enforcer,
+    call_combined_enforcer,
 )
 from poc.delegation import (
     Caveat,
@@ -37,246 +42,214 @@ from poc.caveats import (
 )
 from poc.constants import USDC, WETH, SWAP_ROUTER_02
 
-
-# ---------------------------------------------------------------------------
-# Fixtures
-# ---------------------------------------------------------------------------
-
-@pytest.fixture(scope="module")
-def w3(anvil_local):
-    """Local web3 instance (no mainnet fork)."""
-    w3_instance, _ = anvil_local
-    return w3_instance
-
-
-@pytest.fixture(scope="module")
-def sender(w3):
-    return w3.eth.accounts[0]
-
-
-@pytest.fixture(scope="module")
-def delegator(w3):
-    return w3.eth.accounts[1]
-
-
-@pytest.fixture(scope="module")
-def delegatee(w3):
-    return w3.eth.accounts[2]
+from tests._selectors import TRANSFER_SELECTOR
 
 
-@pytest.fixture(scope="module")
-def targets_enforcer(w3, sender):
-    """Deploy AllowedTargetsEnforcer."""
-    return deploy_allowed_targets_enforcer(w3, sender)
+# Selector plus a zero address argument; tests append the uint256 amount
+_APPROVE_HEAD = bytes.fromhex(APPROVE_SELECTOR.removeprefix("0x")) + bytes(32)
+_TRANSFER_HEAD = bytes.fromhex(TRANSFER_SELECTOR.removeprefix("0x")) + bytes(32)
 
 
-@pytest.fixture(scope="module")
-def methods_enforcer(w3, sender):
-    """Deploy AllowedMethodsEnforcer."""
-    return deploy_allowed_methods_enforcer(w3, sender)
-
-
-@pytest.fixture(scope="module")
-def value_enforcer(w3, sender):
-    """Deploy ValueLimitEnforcer."""
-    return deploy_value_limit_enforcer(w3, sender)
-
-
-@pytest.fixture(scope="module")
-def mock_erc20(w3, sender):
-    """Deploy a minimal mock ERC-20 (same as test_caveats_local.py)."""
-    runtime_hex = (
-        "6000" "35" "60e0" "1c" "80"
-        "63095ea7b3" "14" "6019" "57"
-        "6370a08231" "14" "6026" "57"
-        "600080fd"
-        "5b" "6001" "6000" "52" "6020" "6000" "f3"
-        "5b" "6000" "6000" "52" "6020" "6000" "f3"
-    )
-    runtime = bytes.fromhex(runtime_hex)
-    runtime_len = len(runtime)
-    init_hex = (
-        f"60{runtime_len:02x}" "600a" "6000" "39"
-        f"60{runtime_len:02x}" "6000" "f3"
-    )
-    deploy_data = "0x" + init_hex + runtime_hex
-    tx_hash = w3.eth.send_transaction({"from": sender, "data": deploy_data})
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-    assert receipt["status"] == 1
-    return receipt["contractAddress"]
+# One anvil for both local-EVM modules under pytest -n auto --dist loadgroup.
+# Delegated calls send real transactions, so each test's are rolled back.
+pytestmark = [
+    pytest.mark.xdist_group("anvil_local"),
+    pytest.mark.usefixtures("fresh_local"),
+]
 
 
 # ---------------------------------------------------------------------------
-# AllowedTargetsEnforcer on-chain tests
+# Generic enforcers on-chain (AllowedTargets, AllowedMethods, ValueLimit)
 # ---------------------------------------------------------------------------
 
-class TestAllowedTargetsEnforcerOnChain:
-    """Test the deployed AllowedTargetsEnforcer contract."""
-
-    def test_deploys_with_code(self, w3, targets_enforcer):
-        """The deployed contract must have bytecode."""
-        code = w3.eth.get_code(targets_enforcer)
-        assert len(code) > 2
-
-    def test_allowed_target_passes(self, w3, sender, targets_enforcer):
-        """A target in the allowed list should succeed."""
-        call_allowed_targets_enforcer(
-            w3, targets_enforcer,
-            target=USDC,
-            allowed=[USDC, SWAP_ROUTER_02],
-            sender=sender,
-        )
-
-    def test_second_target_passes(self, w3, sender, targets_enforcer):
-        """Second element in the allowed list should also pass."""
-        call_allowed_targets_enforcer(
-            w3, targets_enforcer,
-            target=SWAP_ROUTER_02,
-            allowed=[USDC, SWAP_ROUTER_02],
-            sender=sender,
-        )
-
-    def test_disallowed_target_reverts(self, w3, sender, targets_enforcer):
-        """A target NOT in the allowed list should revert."""
-        with pytest.raises(Exception):
-            call_allowed_targets_enforcer(
-                w3, targets_enforcer,
-                target=WETH,
-                allowed=[USDC, SWAP_ROUTER_02],
-                sender=sender,
-            )
+_USDC_CAP = 10_000 * 10**6  # 10k USDC in raw units (6 decimals)
+
+# (enforcer fixture, call helper, call kwargs, should_revert)
+_ENFORCER_CASES = [
+    # AllowedTargetsEnforcer
+    pytest.param(
+        "targets_enforcer", call_allowed_targets_enforcer,
+        dict(target=USDC, allowed=[USDC, SWAP_ROUTER_02]), False,
+        id="targets-allowed",
+    ),
+    pytest.param(
+        "targets_enforcer", call_allowed_targets_enforcer,
+        dict(target=SWAP_ROUTER_02, allowed=[USDC, SWAP_ROUTER_02]), False,
+        id="targets-second-allowed",
+    ),
+    pytest.param(
+        "targets_enforcer", call_allowed_targets_enforcer,
+        dict(target=USDC, allowed=[USDC]), False,
+        id="targets-single-allowed",
+    ),
+    pytest.param(
+        "targets_enforcer", call_allowed_targets_enforcer,
+        dict(target=WETH, allowed=[USDC, SWAP_ROUTER_02]), True,
+        id="targets-disallowed",
+    ),
+    pytest.param(
+        "targets_enforcer", call_allowed_targets_enforcer,
+        dict(target=USDC, allowed=[]), True,
+        id="targets-empty-list",
+    ),
+    # AllowedMethodsEnforcer
+    pytest.param(
+        "methods_enforcer", call_allowed_methods_enforcer,
+        dict(
+            method_selector=APPROVE_SELECTOR,
+            allowed=[APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR],
+        ), False,
+        id="methods-allowed",
+    ),
+    pytest.param(
+        "methods_enforcer", call_allowed_methods_enforcer,
+        dict(
+            method_selector=EXACT_INPUT_SINGLE_SELECTOR,
+            allowed=[APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR],
+        ), False,
+        id="methods-second-allowed",
+    ),
+    pytest.param(
+        "methods_enforcer", call_allowed_methods_enforcer,
+        dict(method_selector="0xdeadbeef", allowed=[APPROVE_SELECTOR]), True,
+        id="methods-disallowed",
+    ),
+    pytest.param(
+        # transfer() must fail when only approve() and the swap are allowed
+        "methods_enforcer", call_allowed_methods_enforcer,
+        dict(
+            method_selector=TRANSFER_SELECTOR,
+            allowed=[APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR],
+        ), True,
+        id="methods-transfer-not-allowed",
+    ),
+    # ValueLimitEnforcer
+    pytest.param(
+        "value_enforcer", call_value_limit_enforcer,
+        dict(amount=500, cap=1000), False,
+        id="value-under-cap",
+    ),
+    pytest.param(
+        "value_enforcer", call_value_limit_enforcer,
+        dict(amount=1000, cap=1000), False,
+        id="value-at-cap",
+    ),
+    pytest.param(
+        "value_enforcer", call_value_limit_enforcer,
+        dict(amount=0, cap=1000), False,
+        id="value-zero",
+    ),
+    pytest.param(
+        "value_enforcer", call_value_limit_enforcer,
+        dict(amount=1001, cap=1000), True,
+        id="value-over-cap",
+    ),
+    pytest.param(
+        "value_enforcer", call_value_limit_enforcer,
+        dict(amount=9_999 * 10**6, cap=_USDC_CAP), False,
+        id="value-usdc-under-cap",
+    ),
+    pytest.param(
+        "value_enforcer", call_value_limit_enforcer,
+        dict(amount=10_001 * 10**6, cap=_USDC_CAP), True,
+        id="value-usdc-over-cap",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "enforcer", ["targets_enforcer", "methods_enforcer", "value_enforcer"],
+)
+def test_enforcer_deploys_with_code(w3, request, enforcer):
+    """Each deployed enforcer contract must have bytecode."""
+    code = w3.eth.get_code(request.getfixturevalue(enforcer))
+    assert len(code) > 2
 
-    def test_empty_allowed_list_reverts(self, w3, sender, targets_enforcer):
-        """An empty allowed list should always revert."""
-        with pytest.raises(Exception):
-            call_allowed_targets_enforcer(
-                w3, targets_enforcer,
-                target=USDC,
-                allowed=[],
-                sender=sender,
-            )
 
-    def test_single_allowed_target(self, w3, sender, targets_enforcer):
-        """A single-element allowed list should work."""
-        call_allowed_targets_enforcer(
-            w3, targets_enforcer,
-            target=USDC,
-            allowed=[USDC],
-            sender=sender,
-        )
+@pytest.mark.parametrize("enforcer,call,kwargs,should_revert", _ENFORCER_CASES)
+def test_enforcer_call(w3, sender, request, enforcer, call, kwargs, should_revert):
+    """The enforcer returns for allowed input and reverts otherwise."""
+    address = request.getfixturevalue(enforcer)
+    if should_revert:
+        with pytest.raises(ContractLogicError):
+            call(w3, address, sender=sender, **kwargs)
+    else:
+        call(w3, address, sender=sender, **kwargs)
 
 
 # ---------------------------------------------------------------------------
-# AllowedMethodsEnforcer on-chain tests
+# Specialized (allowlist baked into bytecode) enforcers
 # ---------------------------------------------------------------------------
 
-class TestAllowedMethodsEnforcerOnChain:
-    """Test the deployed AllowedMethodsEnforcer contract."""
-
-    def test_deploys_with_code(self, w3, methods_enforcer):
-        code = w3.eth.get_code(methods_enforcer)
-        assert len(code) > 2
+class TestSpecializedEnforcersOnChain:
+    """Enforcers deployed per allowlist, called with just the item."""
 
-    def test_allowed_method_passes(self, w3, sender, methods_enforcer):
-        """approve selector should pass when in the allowed list."""
-        call_allowed_methods_enforcer(
-            w3, methods_enforcer,
-            method_selector=APPROVE_SELECTOR,
-            allowed=[APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR],
-            sender=sender,
+    @pytest.fixture(scope="class")
+    def targets(self, w3, sender):
+        return deploy_specialized_allowed_targets_enforcer(
+            w3, sender, [USDC, SWAP_ROUTER_02],
         )
 
-    def test_second_method_passes(self, w3, sender, methods_enforcer):
-        """exactInputSingle selector should also pass."""
-        call_allowed_methods_enforcer(
-            w3, methods_enforcer,
-            method_selector=EXACT_INPUT_SINGLE_SELECTOR,
-            allowed=[APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR],
-            sender=sender,
+    @pytest.fixture(scope="class")
+    def methods(self, w3, sender):
+        return deploy_specialized_allowed_methods_enforcer(
+            w3, sender, [APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR],
         )
 
-    def test_disallowed_method_reverts(self, w3, sender, methods_enforcer):
-        """A random selector should revert."""
-        with pytest.raises(Exception):
-            call_allowed_methods_enforcer(
-                w3, methods_enforcer,
-                method_selector="0xdeadbeef",
-                allowed=[APPROVE_SELECTOR],
-                sender=sender,
-            )
+    def test_allowed_target_passes(self, w3, sender, targets):
+        call_specialized_allowed_targets_enforcer(
+            w3, targets, target=SWAP_ROUTER_02, sender=sender,
+        )
 
-    def test_transfer_method_not_allowed(self, w3, sender, methods_enforcer):
-        """transfer() selector should fail when only approve() is allowed."""
-        transfer_sel = Web3.keccak(text="transfer(address,uint256)")[:4].hex()
-        with pytest.raises(Exception):
-            call_allowed_methods_enforcer(
-                w3, methods_enforcer,
-                method_selector=transfer_sel,
-                allowed=[APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR],
-                sender=sender,
+    def test_disallowed_target_reverts(self, w3, sender, targets):
+        with pytest.raises(ContractLogicError):
+            call_specialized_allowed_targets_enforcer(
+                w3, targets, target=WETH, sender=sender,
             )
 
+    def test_allowed_method_passes(self, w3, sender, methods):
+        call_specialized_allowed_methods_enforcer(
+            w3, methods, method_selector=EXACT_INPUT_SINGLE_SELECTOR, sender=sender,
+        )
 
-# ---------------------------------------------------------------------------
-# ValueLimitEnforcer on-chain tests
-# ---------------------------------------------------------------------------
+    def test_disallowed_method_reverts(self, w3, sender, methods):
+        with pytest.raises(ContractLogicError):
+            call_specialized_allowed_methods_enforcer(
+                w3, methods, method_selector="0xdeadbeef", sender=sender,
+            )
 
-class TestValueLimitEnforcerOnChain:
-    """Test the deployed ValueLimitEnforcer contract."""
 
-    def test_deploys_with_code(self, w3, value_enforcer):
-        code = w3.eth.get_code(value_enforcer)
-        assert len(code) > 2
+class TestCombinedEnforcerOnChain:
+    """One enforcer checking target, method and cap in a single call."""
 
-    def test_under_cap_passes(self, w3, sender, value_enforcer):
-        call_value_limit_enforcer(
-            w3, value_enforcer,
-            amount=500,
-            cap=1000,
-            sender=sender,
-        )
+    CAP = 10_000 * 10**6
 
-    def test_at_cap_passes(self, w3, sender, value_enforcer):
-        call_value_limit_enforcer(
-            w3, value_enforcer,
-            amount=1000,
-            cap=1000,
-            sender=sender,
+    @pytest.fixture(scope="class")
+    def combined(self, w3, sender):
+        return deploy_combined_enforcer(
+            w3, sender,
+            allowed_targets=[USDC, SWAP_ROUTER_02],
+            allowed_methods=[APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR],
+            cap=self.CAP,
         )
 
-    def test_over_cap_reverts(self, w3, sender, value_enforcer):
-        with pytest.raises(Exception):
-            call_value_limit_enforcer(
-                w3, value_enforcer,
-                amount=1001,
-                cap=1000,
-                sender=sender,
-            )
-
-    def test_zero_amount_passes(self, w3, sender, value_enforcer):
-        call_value_limit_enforcer(
-            w3, value_enforcer,
-            amount=0,
-            cap=1000,
+    def test_valid_call_passes(self, w3, sender, combined):
+        call_combined_enforcer(
+            w3, combined,
+            target=USDC, method_selector=APPROVE_SELECTOR, amount=self.CAP,
             sender=sender,
         )
 
-    def test_realistic_usdc_amounts(self, w3, sender, value_enforcer):
-        """Test with realistic USDC amounts (6 decimals)."""
-        max_usdc = 10_000 * 10**6
-        # Under cap
-        call_value_limit_enforcer(
-            w3, value_enforcer,
-            amount=9_999 * 10**6,
-            cap=max_usdc,
-            sender=sender,
-        )
-        # Over cap
-        with pytest.raises(Exception):
-            call_value_limit_enforcer(
-                w3, value_enforcer,
-                amount=10_001 * 10**6,
-                cap=max_usdc,
+    @pytest.mark.parametrize("target,method,amount", [
+        (WETH, APPROVE_SELECTOR, 1),
+        (USDC, "0xdeadbeef", 1),
+        (USDC, APPROVE_SELECTOR, CAP + 1),
+    ])
+    def test_any_violation_reverts(self, w3, sender, combined, target, method, amount):
+        with pytest.raises(ContractLogicError):
+            call_combined_enforcer(
+                w3, combined,
+                target=target, method_selector=method, amount=amount,
                 sender=sender,
             )
 
@@ -285,6 +258,20 @@ class TestValueLimitEnforcerOnChain:
 # End-to-end delegation flow on local EVM
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="module")
+def base_delegation(delegator, delegatee, mock_erc20):
+    """approve() on the mock ERC-20, capped at 10_000, shared by the flow tests."""
+    return Delegation(
+        delegator=delegator,
+        delegatee=delegatee,
+        caveats=(
+            Caveat("AllowedTargets", [mock_erc20]),
+            Caveat("AllowedMethods", [APPROVE_SELECTOR]),
+            Caveat("ERC20TransferAmount", {"token": mock_erc20, "maxAmount": 10_000}),
+        ),
+    )
+
+
 class TestDelegationFlowLocal:
     """Test the full delegation lifecycle on a local Anvil instance.
 
@@ -293,148 +280,61 @@ class TestDelegationFlowLocal:
     - Violations are caught before execution reaches the chain
     """
 
-    def test_delegated_approve_succeeds(self, w3, delegator, delegatee, mock_erc20):
+    def test_delegated_approve_succeeds(self, w3, base_delegation, mock_erc20):
         """A delegated approve() call should succeed when caveats allow it."""
-        # Create delegation allowing approve() on the mock ERC-20
-        delegation = Delegation(
-            delegator=delegator,
-            delegatee=delegatee,
-            caveats=(
-                Caveat("AllowedTargets", [mock_erc20]),
-                Caveat("AllowedMethods", [APPROVE_SELECTOR]),
-                Caveat("ERC20TransferAmount", {"token": mock_erc20, "maxAmount": 10_000}),
-            ),
-        )
+        # approve(address(0), 5000)
+        calldata = _APPROVE_HEAD + (5_000).to_bytes(32, "big")
 
-        # Build approve(address, uint256) calldata
-        spender = "0x" + "00" * 20
-        calldata = (
-            bytes.fromhex(APPROVE_SELECTOR[2:])
-            + bytes.fromhex(spender[2:].zfill(64))
-            + (5_000).to_bytes(32, "big")
-        )
-
-        # Execute delegated call
         receipt = execute_delegated_call(
-            w3, delegation,
+            w3, base_delegation,
             target=mock_erc20,
             calldata=calldata,
         )
         assert receipt["status"] == 1
 
-    def test_delegated_call_wrong_target_rejected(self, w3, delegator, delegatee, mock_erc20):
-        """Calling an unapproved target should be rejected before execution."""
-        other_target = "0x" + "ab" * 20
-
-        delegation = Delegation(
-            delegator=delegator,
-            delegatee=delegatee,
-            caveats=(
-                Caveat("AllowedTargets", [mock_erc20]),
-                Caveat("AllowedMethods", [APPROVE_SELECTOR]),
-                Caveat("ERC20TransferAmount", {"token": mock_erc20, "maxAmount": 10_000}),
-            ),
-        )
-
-        calldata = (
-            bytes.fromhex(APPROVE_SELECTOR[2:])
-            + bytes(32)
-            + (100).to_bytes(32, "big")
-        )
-
-        with pytest.raises(EnforcementError, match="AllowedTargets"):
-            execute_delegated_call(
-                w3, delegation,
-                target=other_target,
-                calldata=calldata,
-            )
-
-    def test_delegated_call_wrong_method_rejected(self, w3, delegator, delegatee, mock_erc20):
-        """Calling a disallowed method should be rejected."""
-        delegation = Delegation(
-            delegator=delegator,
-            delegatee=delegatee,
-            caveats=(
-                Caveat("AllowedTargets", [mock_erc20]),
-                Caveat("AllowedMethods", [APPROVE_SELECTOR]),
-                Caveat("ERC20TransferAmount", {"token": mock_erc20, "maxAmount": 10_000}),
-            ),
-        )
-
-        # Use transfer selector instead of approve
-        transfer_selector = Web3.keccak(text="transfer(address,uint256)")[:4]
-        calldata = (
-            transfer_selector
-            + bytes(32)
-            + (100).to_bytes(32, "big")
-        )
-
-        with pytest.raises(EnforcementError, match="AllowedMethods"):
+    # target None means the mock ERC-20 itself
+    @pytest.mark.parametrize("target,head,amount,enforcer", [
+        pytest.param("0x" + "ab" * 20, _APPROVE_HEAD, 100, "AllowedTargets",
+                     id="wrong-target"),
+        pytest.param(None, _TRANSFER_HEAD, 100, "AllowedMethods",
+                     id="wrong-method"),
+        pytest.param(None, _APPROVE_HEAD, 20_000, "ERC20TransferAmount",
+                     id="over-cap"),
+    ])
+    def test_violation_rejected(
+        self, w3, base_delegation, mock_erc20, target, head, amount, enforcer,
+    ):
+        """A call breaking one caveat is rejected before execution."""
+        calldata = head + amount.to_bytes(32, "big")
+
+        with pytest.raises(EnforcementError, match=enforcer):
             execute_delegated_call(
-                w3, delegation,
-                target=mock_erc20,
+                w3, base_delegation,
+                target=target or mock_erc20,
                 calldata=calldata,
             )
 
-    def test_delegated_call_over_cap_rejected(self, w3, delegator, delegatee, mock_erc20):
-        """Exceeding the spending cap should be rejected."""
-        delegation = Delegation(
-            delegator=delegator,
-            delegatee=delegatee,
-            caveats=(
-                Caveat("AllowedTargets", [mock_erc20]),
-                Caveat("AllowedMethods", [APPROVE_SELECTOR]),
-                Caveat("ERC20TransferAmount", {"token": mock_erc20, "maxAmount": 1_000}),
-            ),
-        )
-
-        # Amount exceeds cap
-        calldata = (
-            bytes.fromhex(APPROVE_SELECTOR[2:])
-            + bytes(32)
-            + (2_000).to_bytes(32, "big")
-        )
-
-        with pytest.raises(EnforcementError, match="ERC20TransferAmount"):
-            execute_delegated_call(
-                w3, delegation,
-                target=mock_erc20,
-                calldata=calldata,
-            )
-
-    def test_delegation_from_phase0_caveats(self, w3, delegator, delegatee, mock_erc20):
+    def test_delegation_from_phase0_caveats(self, w3, base_delegation, mock_erc20):
         """A delegation built from Phase 0 caveat map should enforce correctly."""
-        # Use the Phase 0 caveat map but with mock_erc20 as target
-        # We can't use the real USDC address since we're on a clean Anvil
+        # The Phase 0 USDC cap, applied to mock_erc20 since we can't use
+        # the real USDC address on a clean Anvil
         max_usdc = 10_000 * 10**6
-
-        delegation = Delegation(
-            delegator=delegator,
-            delegatee=delegatee,
-            caveats=(
-                Caveat("AllowedTargets", [mock_erc20]),
-                Caveat("AllowedMethods", [APPROVE_SELECTOR]),
+        delegation = replace(
+            base_delegation,
+            caveats=base_delegation.caveats[:2] + (
                 Caveat("ERC20TransferAmount", {"token": mock_erc20, "maxAmount": max_usdc}),
             ),
         )
 
         # Valid call
-        calldata = (
-            bytes.fromhex(APPROVE_SELECTOR[2:])
-            + bytes(32)
-            + (5_000 * 10**6).to_bytes(32, "big")
-        )
+        calldata = _APPROVE_HEAD + (5_000 * 10**6).to_bytes(32, "big")
         receipt = execute_delegated_call(
             w3, delegation, target=mock_erc20, calldata=calldata,
         )
         assert receipt["status"] == 1
 
         # Over cap → rejected
-        calldata_over = (
-            bytes.fromhex(APPROVE_SELECTOR[2:])
-            + bytes(32)
-            + (20_000 * 10**6).to_bytes(32, "big")
-        )
+        calldata_over = _APPROVE_HEAD + (20_000 * 10**6).to_bytes(32, "big")
         with pytest.raises(EnforcementError, match="ERC20TransferAmount"):
             execute_delegated_call(
                 w3, delegation, target=mock_erc20, calldata=calldata_over,
@@ -10,6 +10,8 @@ without any EVM interaction. They cover:
   - Violation scenarios (wrong target, wrong method, over-cap)
 """
 
+import pickle
+
 import pytest
 from web3 import Web3
 
@@ -21,16 +23,22 @@ from poc.delegation import (
     enforce_allowed_methods,
     enforce_erc20_transfer_amount,
     validate_delegation,
+    validate_many,
+    validate_against_many,
     delegation_from_caveat_map,
     _extract_uint256_param,
+    _norm_addr,
 )
 from poc.caveats import (
     usdc_weth_swap_caveats,
+    Caveats,
     APPROVE_SELECTOR,
     EXACT_INPUT_SINGLE_SELECTOR,
 )
 from poc.constants import USDC, WETH, SWAP_ROUTER_02, POOL_FEE
 
+from tests._selectors import TRANSFER_SELECTOR
+
 
 # ---------------------------------------------------------------------------
 # Test addresses
@@ -40,18 +48,22 @@ DELEGATOR = "0x000000000000000000000000000000000000dEaD"
 DELEGATEE = "0x0000000000000000000000000000000000001234"
 RANDOM_ADDR = "0x0000000000000000000000000000000000005678"
 
+# Spender argument and raw selectors, decoded once for calldata building
+ROUTER_INT = int(SWAP_ROUTER_02, 16)
+APPROVE_SEL_BYTES = bytes.fromhex(APPROVE_SELECTOR.removeprefix("0x"))
+EXACT_INPUT_SINGLE_SEL_BYTES = bytes.fromhex(
+    EXACT_INPUT_SINGLE_SELECTOR.removeprefix("0x")
+)
+TRANSFER_SEL_BYTES = bytes.fromhex(TRANSFER_SELECTOR.removeprefix("0x"))
+
 
 # ---------------------------------------------------------------------------
 # Helper: build calldata
 # ---------------------------------------------------------------------------
 
-def _build_calldata(selector: str, *uint256_args: int) -> bytes:
-    """Build calldata from a 4-byte selector and uint256 arguments."""
-    sel_hex = selector[2:] if selector.startswith("0x") else selector
-    data = bytes.fromhex(sel_hex)
-    for arg in uint256_args:
-        data += arg.to_bytes(32, "big")
-    return data
+def _build_calldata(selector: bytes, *uint256_args: int) -> bytes:
+    """Build calldata from a raw 4-byte selector and uint256 arguments."""
+    return b"".join([selector, *[arg.to_bytes(32, "big") for arg in uint256_args]])
 
 
 # ---------------------------------------------------------------------------
@@ -59,69 +71,100 @@ def _build_calldata(selector: str, *uint256_args: int) -> bytes:
 # ---------------------------------------------------------------------------
 
 class TestEnforceAllowedTargets:
-    def test_target_in_list_passes(self):
-        enforce_allowed_targets(USDC, [USDC, SWAP_ROUTER_02])
-
-    def test_target_not_in_list_raises(self):
-        with pytest.raises(EnforcementError, match="AllowedTargets"):
-            enforce_allowed_targets(WETH, [USDC, SWAP_ROUTER_02])
-
-    def test_single_allowed_target(self):
-        enforce_allowed_targets(USDC, [USDC])
+    @pytest.mark.parametrize("target,allowed", [
+        pytest.param(USDC, [USDC, SWAP_ROUTER_02], id="in-list"),
+        pytest.param(USDC, [USDC], id="single-allowed"),
+        # Addresses are compared after normalization
+        pytest.param(USDC.lower(), [USDC], id="case-insensitive"),
+        pytest.param(USDC[2:], [USDC], id="unprefixed-target"),
+        pytest.param(USDC, [USDC[2:].upper()], id="unprefixed-allowed"),
+    ])
+    def test_allowed_target_passes(self, target, allowed):
+        enforce_allowed_targets(target, allowed)
 
-    def test_empty_allowed_list_raises(self):
+    @pytest.mark.parametrize("target,allowed", [
+        pytest.param(WETH, [USDC, SWAP_ROUTER_02], id="not-in-list"),
+        pytest.param(USDC, [], id="empty-list"),
+    ])
+    def test_disallowed_target_raises(self, target, allowed):
         with pytest.raises(EnforcementError, match="AllowedTargets"):
-            enforce_allowed_targets(USDC, [])
-
-    def test_case_insensitive_comparison(self):
-        """Addresses should be compared after checksum normalization."""
-        lower = USDC.lower()
-        enforce_allowed_targets(lower, [USDC])
+            enforce_allowed_targets(target, allowed)
 
     def test_error_message_includes_target(self):
         with pytest.raises(EnforcementError) as exc_info:
             enforce_allowed_targets(WETH, [USDC])
         assert WETH in str(exc_info.value) or Web3.to_checksum_address(WETH) in str(exc_info.value)
 
+    def test_normalization_is_memoized(self):
+        _norm_addr.cache_clear()
+        first = _norm_addr(USDC)
+        assert _norm_addr(USDC) is first
+        assert _norm_addr.cache_info().hits == 1
+        assert first == USDC.lower()
+
+    @pytest.mark.parametrize("address", [
+        pytest.param("0x1234", id="short"),
+        pytest.param(USDC + "00", id="long"),
+        pytest.param("0x" + "zz" * 20, id="not-hex"),
+    ])
+    def test_malformed_address_is_rejected(self, address):
+        with pytest.raises(ValueError, match="20-byte"):
+            enforce_allowed_targets(address, [USDC])
+
 
 # ---------------------------------------------------------------------------
 # AllowedMethods enforcer
 # ---------------------------------------------------------------------------
 
-class TestEnforceAllowedMethods:
-    def test_allowed_selector_passes(self):
-        calldata = _build_calldata(APPROVE_SELECTOR, 0, 1000)
-        enforce_allowed_methods(calldata, [APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR])
+# approve() calldata variants, built once for the parametrized cases
+_APPROVE_0_1000 = _build_calldata(APPROVE_SEL_BYTES, 0, 1000)
+_APPROVE_0 = _build_calldata(APPROVE_SEL_BYTES, 0)
+_APPROVE_0_100 = _build_calldata(APPROVE_SEL_BYTES, 0, 100)
 
-    def test_disallowed_selector_raises(self):
-        calldata = _build_calldata("0xdeadbeef", 0)
-        with pytest.raises(EnforcementError, match="AllowedMethods"):
-            enforce_allowed_methods(calldata, [APPROVE_SELECTOR])
 
-    def test_short_calldata_raises(self):
-        with pytest.raises(EnforcementError, match="calldata too short"):
-            enforce_allowed_methods(b"\x00\x01\x02", [APPROVE_SELECTOR])
+class TestEnforceAllowedMethods:
+    @pytest.mark.parametrize("calldata,allowed", [
+        pytest.param(
+            _APPROVE_0_1000, [APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR],
+            id="in-list",
+        ),
+        # Selector only, no args
+        pytest.param(APPROVE_SEL_BYTES, [APPROVE_SELECTOR], id="exact-4-bytes"),
+        pytest.param(_APPROVE_0, ["0x095ea7b3"], id="0x-prefix"),
+        pytest.param(_APPROVE_0, ["095ea7b3"], id="no-prefix"),
+        pytest.param(
+            bytearray(_APPROVE_0), ["0x095EA7B3"], id="uppercase-bytearray",
+        ),
+    ])
+    def test_allowed_selector_passes(self, calldata, allowed):
+        enforce_allowed_methods(calldata, allowed)
+
+    @pytest.mark.parametrize("calldata,match", [
+        pytest.param(_build_calldata(b"\xde\xad\xbe\xef", 0), "AllowedMethods",
+                     id="disallowed"),
+        pytest.param(b"\x00\x01\x02", "calldata too short", id="short"),
+        pytest.param(b"", "calldata too short", id="empty"),
+    ])
+    def test_bad_calldata_raises(self, calldata, match):
+        with pytest.raises(EnforcementError, match=match):
+            enforce_allowed_methods(calldata, [APPROVE_SELECTOR])
 
-    def test_empty_calldata_raises(self):
-        with pytest.raises(EnforcementError, match="calldata too short"):
-            enforce_allowed_methods(b"", [APPROVE_SELECTOR])
-
-    def test_exact_4_bytes_works(self):
-        """Calldata with exactly 4 bytes (selector only, no args) should work."""
-        sel_hex = APPROVE_SELECTOR[2:] if APPROVE_SELECTOR.startswith("0x") else APPROVE_SELECTOR
-        calldata = bytes.fromhex(sel_hex)
-        enforce_allowed_methods(calldata, [APPROVE_SELECTOR])
-
-    def test_selector_with_and_without_0x_prefix(self):
-        """Both 0x-prefixed and non-prefixed selectors should work."""
-        calldata = _build_calldata(APPROVE_SELECTOR, 0)
-        # With 0x
-        enforce_allowed_methods(calldata, ["0x095ea7b3"])
-        # Without 0x
-        enforce_allowed_methods(calldata, ["095ea7b3"])
+    def test_short_allowed_entry_is_not_a_prefix_match(self):
+        """A 2-byte "selector" must not accept calldata that starts with it."""
+        with pytest.raises(EnforcementError, match="AllowedMethods"):
+            enforce_allowed_methods(_APPROVE_0, ["0x095e"])
+        d = Delegation(DELEGATOR, DELEGATEE, (
+            Caveat("AllowedTargets", [USDC]),
+            Caveat("AllowedMethods", ["0x095e"]),
+        ))
+        assert d._pairs == frozenset()
+        with pytest.raises(EnforcementError, match="AllowedMethods"):
+            validate_delegation(d, caller=DELEGATEE, target=USDC, calldata=_APPROVE_0)
+        with pytest.raises(EnforcementError, match="AllowedMethods"):
+            d.compile()(USDC, _APPROVE_0, 0)
 
     def test_error_message_includes_selector(self):
-        calldata = _build_calldata("0xdeadbeef")
+        calldata = _build_calldata(b"\xde\xad\xbe\xef")
         with pytest.raises(EnforcementError) as exc_info:
             enforce_allowed_methods(calldata, [APPROVE_SELECTOR])
         assert "deadbeef" in str(exc_info.value).lower()
@@ -171,21 +214,21 @@ class TestEnforceERC20TransferAmount:
 
 class TestExtractUint256Param:
     def test_extract_first_param(self):
-        calldata = _build_calldata("0x12345678", 42, 99)
+        calldata = _build_calldata(b"\x12\x34\x56\x78", 42, 99)
         assert _extract_uint256_param(calldata, 0) == 42
 
     def test_extract_second_param(self):
-        calldata = _build_calldata("0x12345678", 42, 99)
+        calldata = _build_calldata(b"\x12\x34\x56\x78", 42, 99)
         assert _extract_uint256_param(calldata, 1) == 99
 
     def test_calldata_too_short_raises(self):
-        calldata = _build_calldata("0x12345678")  # selector only
+        calldata = _build_calldata(b"\x12\x34\x56\x78")  # selector only
         with pytest.raises(EnforcementError, match="calldata too short"):
             _extract_uint256_param(calldata, 0)
 
     def test_large_uint256(self):
         large = 2**255 - 1
-        calldata = _build_calldata("0x12345678", large)
+        calldata = _build_calldata(b"\x12\x34\x56\x78", large)
         assert _extract_uint256_param(calldata, 0) == large
 
 
@@ -193,23 +236,24 @@ class TestExtractUint256Param:
 # Full delegation validation
 # ---------------------------------------------------------------------------
 
-class TestValidateDelegation:
-    @pytest.fixture()
-    def swap_delegation(self):
-        """Create a delegation for a USDC→WETH swap."""
-        max_usdc = 10_000 * 10**6
-        caveat_map = usdc_weth_swap_caveats(max_usdc=max_usdc, recipient=DELEGATOR)
-        return delegation_from_caveat_map(
-            delegator=DELEGATOR,
-            delegatee=DELEGATEE,
-            caveat_map=caveat_map,
-        )
+@pytest.fixture(scope="module")
+def swap_delegation():
+    """A USDC→WETH swap delegation, built once and shared read-only."""
+    max_usdc = 10_000 * 10**6
+    caveat_map = usdc_weth_swap_caveats(max_usdc=max_usdc, recipient=DELEGATOR)
+    return delegation_from_caveat_map(
+        delegator=DELEGATOR,
+        delegatee=DELEGATEE,
+        caveat_map=caveat_map,
+    )
 
+
+class TestValidateDelegation:
     def test_valid_approve_call_passes(self, swap_delegation):
         """approve(router, 10k USDC) should pass all caveats."""
         calldata = _build_calldata(
-            APPROVE_SELECTOR,
-            int(SWAP_ROUTER_02, 16),  # spender
+            APPROVE_SEL_BYTES,
+            ROUTER_INT,               # spender
             10_000 * 10**6,           # amount
         )
         validate_delegation(
@@ -221,7 +265,7 @@ class TestValidateDelegation:
 
     def test_wrong_caller_raises_value_error(self, swap_delegation):
         """Only the delegatee can use the delegation."""
-        calldata = _build_calldata(APPROVE_SELECTOR, 0, 1000)
+        calldata = _build_calldata(APPROVE_SEL_BYTES, 0, 1000)
         with pytest.raises(ValueError, match="not the delegatee"):
             validate_delegation(
                 swap_delegation,
@@ -230,52 +274,54 @@ class TestValidateDelegation:
                 calldata=calldata,
             )
 
-    def test_wrong_target_raises(self, swap_delegation):
-        """Calling an unapproved contract should fail AllowedTargets."""
-        calldata = _build_calldata(APPROVE_SELECTOR, 0, 1000)
-        with pytest.raises(EnforcementError, match="AllowedTargets"):
-            validate_delegation(
-                swap_delegation,
-                caller=DELEGATEE,
-                target=WETH,  # WETH is not in allowed targets
-                calldata=calldata,
-            )
+    def test_caller_match_ignores_address_case(self, swap_delegation):
+        calldata = _build_calldata(APPROVE_SEL_BYTES, 0, 1000)
+        validate_delegation(
+            swap_delegation,
+            caller=DELEGATEE.upper().replace("0X", "0x"),
+            target=USDC,
+            calldata=calldata,
+        )
 
-    def test_wrong_method_raises(self, swap_delegation):
-        """Calling a disallowed method should fail AllowedMethods."""
-        # transfer(address,uint256) selector
-        transfer_selector = Web3.keccak(text="transfer(address,uint256)")[:4].hex()
-        calldata = _build_calldata(transfer_selector, 0, 1000)
-        with pytest.raises(EnforcementError, match="AllowedMethods"):
+    @pytest.mark.parametrize("target,selector,amount,match", [
+        # WETH is not in allowed targets
+        pytest.param(WETH, APPROVE_SEL_BYTES, 1000, "AllowedTargets", id="wrong-target"),
+        pytest.param(USDC, TRANSFER_SEL_BYTES, 1000, "AllowedMethods", id="wrong-method"),
+        # 20k USDC, cap is 10k
+        pytest.param(USDC, APPROVE_SEL_BYTES, 20_000 * 10**6, "ERC20TransferAmount", id="over-cap"),
+    ])
+    def test_violation_raises(self, swap_delegation, target, selector, amount, match):
+        """Each caveat rejects the call that breaks it, naming itself."""
+        calldata = _build_calldata(selector, ROUTER_INT, amount)
+        with pytest.raises(EnforcementError, match=match):
             validate_delegation(
                 swap_delegation,
                 caller=DELEGATEE,
-                target=USDC,
+                target=target,
                 calldata=calldata,
             )
 
-    def test_over_cap_raises(self, swap_delegation):
-        """Exceeding the USDC cap should fail ERC20TransferAmount."""
-        over_amount = 20_000 * 10**6  # 20k USDC, cap is 10k
-        calldata = _build_calldata(
-            APPROVE_SELECTOR,
-            int(SWAP_ROUTER_02, 16),
-            over_amount,
-        )
-        with pytest.raises(EnforcementError, match="ERC20TransferAmount"):
-            validate_delegation(
-                swap_delegation,
-                caller=DELEGATEE,
-                target=USDC,
-                calldata=calldata,
-            )
+    @pytest.mark.parametrize("allowed,calldata", [
+        pytest.param(["0x"], b"", id="empty-entry-empty-calldata"),
+        pytest.param(["0x095e"], b"\x09\x5e", id="short-entry-short-calldata"),
+        pytest.param([APPROVE_SELECTOR], b"\x09\x5e", id="short-calldata"),
+    ])
+    def test_short_calldata_is_rejected(self, allowed, calldata):
+        """Calldata without a full selector fails AllowedMethods, as the
+        standalone enforcer does, even on the (target, selector) fast path."""
+        d = Delegation(DELEGATOR, DELEGATEE, (
+            Caveat("AllowedTargets", [USDC]),
+            Caveat("AllowedMethods", allowed),
+        ))
+        with pytest.raises(EnforcementError, match="too short"):
+            validate_delegation(d, caller=DELEGATEE, target=USDC, calldata=calldata)
 
     def test_amount_at_cap_passes(self, swap_delegation):
         """Exactly at the cap should pass."""
         exact_amount = 10_000 * 10**6
         calldata = _build_calldata(
-            APPROVE_SELECTOR,
-            int(SWAP_ROUTER_02, 16),
+            APPROVE_SEL_BYTES,
+            ROUTER_INT,
             exact_amount,
         )
         validate_delegation(
@@ -352,6 +398,17 @@ class TestDelegationFromCaveatMap:
         assert cap_caveat.terms["token"] == USDC
         assert cap_caveat.terms["maxAmount"] == max_usdc
 
+    def test_accepts_typed_caveats(self):
+        caveat_map = usdc_weth_swap_caveats(
+            max_usdc=10_000 * 10**6,
+            recipient=DELEGATOR,
+        )
+        from_dict = delegation_from_caveat_map(DELEGATOR, DELEGATEE, caveat_map)
+        from_typed = delegation_from_caveat_map(
+            DELEGATOR, DELEGATEE, Caveats.from_map(caveat_map),
+        )
+        assert from_typed == from_dict
+
     def test_empty_caveat_map(self):
         d = delegation_from_caveat_map(DELEGATOR, DELEGATEE, {})
         assert len(d.caveats) == 0
@@ -367,6 +424,71 @@ class TestDataStructures:
         with pytest.raises(AttributeError):
             c.enforcer = "other"
 
+    def test_allowed_targets_set_is_precomputed(self):
+        c = Caveat("AllowedTargets", [USDC, SWAP_ROUTER_02])
+        assert c._allowed == frozenset({USDC.lower(), SWAP_ROUTER_02.lower()})
+        assert c.terms == [USDC, SWAP_ROUTER_02]
+
+    def test_allowed_methods_set_is_precomputed(self):
+        c = Caveat("AllowedMethods", [APPROVE_SELECTOR, "a9059cbb"])
+        assert c._allowed == frozenset({
+            APPROVE_SEL_BYTES, TRANSFER_SEL_BYTES,
+        })
+
+    def test_transfer_amount_cap_is_cached(self):
+        c = Caveat("ERC20TransferAmount", {"token": USDC, "maxAmount": 1_000})
+        assert c._cap == 1_000
+        assert c == Caveat("ERC20TransferAmount", {"token": USDC, "maxAmount": 1_000})
+
+    def test_caveat_and_delegation_are_slotted(self):
+        c = Caveat("AllowedTargets", [USDC])
+        d = Delegation(DELEGATOR, DELEGATEE, (c,))
+        d.compile()
+        assert not hasattr(c, "__dict__")
+        assert not hasattr(d, "__dict__")
+
+    def test_enforcer_resolved_at_construction(self):
+        assert Caveat("AllowedTargets", [USDC])._enforce is not None
+        assert Caveat("NativeTokenTransferAmount", {"maxAmount": 1})._enforce is None
+
+    def test_mapping_terms_are_read_only(self):
+        terms = {"token": USDC, "maxAmount": 1_000}
+        c = Caveat("ERC20TransferAmount", terms)
+        terms["maxAmount"] = 0
+        assert c.terms["maxAmount"] == 1_000
+        with pytest.raises(TypeError):
+            c.terms["maxAmount"] = 0
+
+    def test_caveats_and_delegations_are_hashable(self):
+        caveats = (
+            Caveat("AllowedTargets", [USDC]),
+            Caveat("ERC20TransferAmount", {"token": USDC, "maxAmount": 1_000}),
+        )
+        same = (
+            Caveat("AllowedTargets", [USDC]),
+            Caveat("ERC20TransferAmount", {"maxAmount": 1_000, "token": USDC}),
+        )
+        assert len(set(caveats + same)) == 2
+        d = Delegation(DELEGATOR, DELEGATEE, caveats)
+        assert hash(d) == hash(Delegation(DELEGATOR, DELEGATEE, same))
+
+    def test_unhashable_terms_only_fail_when_hashed(self):
+        c = Caveat("Custom", {"x": [1, 2]})
+        assert c.terms["x"] == [1, 2]
+        with pytest.raises(TypeError):
+            hash(c)
+
+    def test_caveats_and_delegations_pickle(self):
+        d = Delegation(DELEGATOR, DELEGATEE, (
+            Caveat("AllowedTargets", [USDC]),
+            Caveat("ERC20TransferAmount", {"token": USDC, "maxAmount": 1_000}),
+        ))
+        d.compile()
+        restored = pickle.loads(pickle.dumps(d))
+        assert restored == d
+        assert restored.caveats[1]._cap == 1_000
+        restored.compile()(USDC, _APPROVE_0_100, 0)
+
     def test_delegation_is_frozen(self):
         d = Delegation(delegator=DELEGATOR, delegatee=DELEGATEE)
         with pytest.raises(AttributeError):
@@ -389,61 +511,158 @@ class TestDataStructures:
 # Violation scenario matrix
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="module")
+def delegation():
+    """The violation-matrix delegation (5k USDC cap), shared read-only."""
+    max_usdc = 5_000 * 10**6
+    return Delegation(
+        delegator=DELEGATOR,
+        delegatee=DELEGATEE,
+        caveats=(
+            Caveat("AllowedTargets", [USDC, SWAP_ROUTER_02]),
+            Caveat("AllowedMethods", [APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR]),
+            Caveat("ERC20TransferAmount", {"token": USDC, "maxAmount": max_usdc}),
+        ),
+    )
+
+
 class TestViolationMatrix:
     """Comprehensive violation testing — every enforcer must reject bad input."""
 
-    @pytest.fixture()
-    def delegation(self):
-        max_usdc = 5_000 * 10**6
-        return Delegation(
-            delegator=DELEGATOR,
-            delegatee=DELEGATEE,
-            caveats=(
-                Caveat("AllowedTargets", [USDC, SWAP_ROUTER_02]),
-                Caveat("AllowedMethods", [APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR]),
-                Caveat("ERC20TransferAmount", {"token": USDC, "maxAmount": max_usdc}),
-            ),
-        )
-
     def test_valid_call(self, delegation):
         """Baseline: a valid call should pass."""
-        calldata = _build_calldata(APPROVE_SELECTOR, 0, 5_000 * 10**6)
+        calldata = _build_calldata(APPROVE_SEL_BYTES, 0, 5_000 * 10**6)
         validate_delegation(
             delegation, caller=DELEGATEE, target=USDC, calldata=calldata,
         )
 
-    @pytest.mark.parametrize("bad_target", [
-        WETH,
-        "0x0000000000000000000000000000000000000001",
-        "0x0000000000000000000000000000000000000000",
+    @pytest.mark.parametrize("target,calldata,enforcer", [
+        pytest.param(WETH, _APPROVE_0_100, "AllowedTargets", id="target-weth"),
+        pytest.param(
+            "0x0000000000000000000000000000000000000001", _APPROVE_0_100,
+            "AllowedTargets", id="target-0x01",
+        ),
+        pytest.param(
+            "0x0000000000000000000000000000000000000000", _APPROVE_0_100,
+            "AllowedTargets", id="target-zero",
+        ),
+        pytest.param(
+            USDC, _build_calldata(TRANSFER_SEL_BYTES, 0, 100),  # transfer(address,uint256)
+            "AllowedMethods", id="method-transfer",
+        ),
+        pytest.param(
+            USDC, _build_calldata(b"\x23\xb8\x72\xdd", 0, 100),  # transferFrom(...)
+            "AllowedMethods", id="method-transferFrom",
+        ),
+        pytest.param(
+            USDC, _build_calldata(b"\xde\xad\xbe\xef", 0, 100),
+            "AllowedMethods", id="method-random",
+        ),
+        pytest.param(
+            USDC, _build_calldata(APPROVE_SEL_BYTES, 0, 5_001 * 10**6),
+            "ERC20TransferAmount", id="amount-just-over-cap",
+        ),
+        pytest.param(
+            USDC, _build_calldata(APPROVE_SEL_BYTES, 0, 10_000 * 10**6),
+            "ERC20TransferAmount", id="amount-double-cap",
+        ),
+        pytest.param(
+            USDC, _build_calldata(APPROVE_SEL_BYTES, 0, 2**128),
+            "ERC20TransferAmount", id="amount-absurd",
+        ),
     ])
-    def test_wrong_target_variants(self, delegation, bad_target):
-        calldata = _build_calldata(APPROVE_SELECTOR, 0, 100)
+    def test_violation_variants(self, delegation, target, calldata, enforcer):
+        """Each bad call is rejected by the caveat it breaks."""
+        with pytest.raises(EnforcementError, match=enforcer):
+            validate_delegation(
+                delegation, caller=DELEGATEE, target=target, calldata=calldata,
+            )
+
+    def test_validate_many_accepts_valid_steps(self, delegation):
+        steps = [
+            (USDC, _build_calldata(APPROVE_SEL_BYTES, 0, 100), 0),
+            (SWAP_ROUTER_02, _build_calldata(EXACT_INPUT_SINGLE_SEL_BYTES, 0, 100), 0),
+        ]
+        validate_many(delegation, steps, caller=DELEGATEE)
+
+    def test_validate_many_stops_on_first_violation(self, delegation):
+        steps = [
+            (USDC, _build_calldata(APPROVE_SEL_BYTES, 0, 100), 0),
+            (WETH, _build_calldata(APPROVE_SEL_BYTES, 0, 100), 0),
+            (USDC, _build_calldata(APPROVE_SEL_BYTES, 0, 2**128), 0),
+        ]
+        with pytest.raises(EnforcementError, match="AllowedTargets"):
+            validate_many(delegation, steps, caller=DELEGATEE)
+
+    def test_validate_many_rejects_wrong_caller(self, delegation):
+        with pytest.raises(ValueError, match="not the delegatee"):
+            validate_many(delegation, [], caller=RANDOM_ADDR)
+
+    def test_target_selector_pairs_precomputed(self, delegation):
+        assert (USDC.lower(), APPROVE_SEL_BYTES) in delegation._pairs
+        assert len(delegation._pairs) == 4
+        assert [c.enforcer for c in delegation._rest] == ["ERC20TransferAmount"]
+
+    def test_first_failing_caveat_reported(self, delegation):
+        """A bad target and an over-cap amount report the target caveat."""
+        calldata = _build_calldata(APPROVE_SEL_BYTES, 0, 2**128)
         with pytest.raises(EnforcementError, match="AllowedTargets"):
             validate_delegation(
-                delegation, caller=DELEGATEE, target=bad_target, calldata=calldata,
+                delegation, caller=DELEGATEE, target=WETH, calldata=calldata,
             )
 
-    @pytest.mark.parametrize("bad_selector", [
-        "0xa9059cbb",  # transfer(address,uint256)
-        "0x23b872dd",  # transferFrom(address,address,uint256)
-        "0xdeadbeef",  # random
-    ])
-    def test_wrong_method_variants(self, delegation, bad_selector):
-        calldata = _build_calldata(bad_selector, 0, 100)
-        with pytest.raises(EnforcementError, match="AllowedMethods"):
+    def test_tightest_of_several_caps_applies(self, delegation):
+        tighter = Delegation(
+            delegator=DELEGATOR,
+            delegatee=DELEGATEE,
+            caveats=delegation.caveats + (
+                Caveat("ERC20TransferAmount", {"token": USDC, "maxAmount": 100}),
+            ),
+        )
+        ok = _build_calldata(APPROVE_SEL_BYTES, 0, 100)
+        validate_delegation(tighter, caller=DELEGATEE, target=USDC, calldata=ok)
+        too_much = _build_calldata(APPROVE_SEL_BYTES, 0, 101)
+        with pytest.raises(EnforcementError, match="exceeds cap 100"):
             validate_delegation(
-                delegation, caller=DELEGATEE, target=USDC, calldata=calldata,
+                tighter, caller=DELEGATEE, target=USDC, calldata=too_much,
             )
 
-    @pytest.mark.parametrize("bad_amount", [
-        5_001 * 10**6,      # just over cap
-        10_000 * 10**6,     # double cap
-        2**128,             # absurdly large
-    ])
-    def test_over_cap_variants(self, delegation, bad_amount):
-        calldata = _build_calldata(APPROVE_SELECTOR, 0, bad_amount)
-        with pytest.raises(EnforcementError, match="ERC20TransferAmount"):
+    def test_unknown_enforcer_rejected(self):
+        d = Delegation(
+            delegator=DELEGATOR,
+            delegatee=DELEGATEE,
+            caveats=(Caveat("NativeTokenTransferAmount", {"maxAmount": 1}),),
+        )
+        with pytest.raises(EnforcementError, match="unknown enforcer type"):
             validate_delegation(
-                delegation, caller=DELEGATEE, target=USDC, calldata=calldata,
+                d, caller=DELEGATEE, target=USDC,
+                calldata=_build_calldata(APPROVE_SEL_BYTES, 0, 1),
             )
+
+    def test_compiled_validator_is_cached(self, delegation):
+        assert delegation.compile() is delegation.compile()
+
+    def test_compiled_validator_enforces_caveats(self, delegation):
+        check = delegation.compile()
+        check(USDC, _build_calldata(APPROVE_SEL_BYTES, 0, 5_000 * 10**6))
+        with pytest.raises(EnforcementError, match="AllowedTargets"):
+            check(WETH, _build_calldata(APPROVE_SEL_BYTES, 0, 100))
+        with pytest.raises(EnforcementError, match="AllowedMethods"):
+            check(USDC, _build_calldata(b"\xde\xad\xbe\xef", 0, 100))
+        with pytest.raises(EnforcementError, match="ERC20TransferAmount"):
+            check(USDC, _build_calldata(APPROVE_SEL_BYTES, 0, 5_001 * 10**6))
+
+    def test_validate_against_many_delegations(self, delegation):
+        other_delegatee = Delegation(
+            delegator=DELEGATOR, delegatee=RANDOM_ADDR, caveats=delegation.caveats,
+        )
+        tight = Delegation(
+            delegator=DELEGATOR,
+            delegatee=DELEGATEE,
+            caveats=(Caveat("ERC20TransferAmount", {"token": USDC, "maxAmount": 1}),),
+        )
+        calldata = _build_calldata(APPROVE_SEL_BYTES, 0, 100)
+        assert validate_against_many(
+            [delegation, other_delegatee, tight],
+            caller=DELEGATEE, target=USDC, calldata=calldata,
+        ) == [True, False, False]
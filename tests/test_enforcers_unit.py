@@ -0,0 +1,137 @@
+"""Unit tests for the hand-assembled enforcer bytecode (no EVM needed).
+
+These tests check the static shape of the bytecode in poc/enforcers.py:
+  - every PUSH that feeds a JUMP/JUMPI lands on a JUMPDEST
+  - specialized enforcers embed their allowlist
+  - the init code copies the runtime from the right offset
+  - cached calldata encoding matches eth_abi
+"""
+
+import pytest
+from eth_abi import encode
+from web3 import Web3
+
+from poc.caveats import APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR
+from poc.constants import USDC, SWAP_ROUTER_02
+from poc.enforcers import (
+    _build_combined_enforcer_bytecode,
+    _build_specialized_allowed_methods_bytecode,
+    _build_specialized_allowed_targets_bytecode,
+    _encode_address,
+    _encode_address_array,
+    _encode_bytes4,
+    _encode_value_limit_call,
+    _runtime_hex,
+    VALUE_LIMIT_ENFORCE_SIG,
+    _wrap_with_init_code,
+)
+
+# Long enough that the unrolled code runs past byte 255 (307 bytes), so
+# its jump labels need PUSH2; see test_long_allowlist_jumps_past_byte_255
+MANY_TARGETS = [f"0x{0x1000 + i:040x}" for i in range(30)]
+
+RUNTIMES = {
+    "targets": _runtime_hex("allowed_targets"),
+    "methods": _runtime_hex("allowed_methods"),
+    "value": _runtime_hex("value_limit"),
+    "specialized_targets": _build_specialized_allowed_targets_bytecode(
+        [USDC, SWAP_ROUTER_02],
+    ),
+    "specialized_targets_long": _build_specialized_allowed_targets_bytecode(
+        MANY_TARGETS,
+    ),
+    "specialized_methods": _build_specialized_allowed_methods_bytecode(
+        [APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR],
+    ),
+    "combined": _build_combined_enforcer_bytecode(
+        [USDC, SWAP_ROUTER_02],
+        [APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR],
+        10_000 * 10**6,
+    ),
+}
+
+JUMP, JUMPI, JUMPDEST, PUSH1, PUSH2 = 0x56, 0x57, 0x5b, 0x60, 0x61
+
+
+def _instructions(code: bytes):
+    """Yield (offset, opcode, immediate) for each instruction in *code*."""
+    i = 0
+    while i < len(code):
+        opcode = code[i]
+        size = opcode - 0x5f if 0x60 <= opcode <= 0x7f else 0
+        yield i, opcode, code[i + 1 : i + 1 + size]
+        i += 1 + size
+
+
+@pytest.mark.parametrize("name", RUNTIMES)
+def test_jump_targets_are_jumpdests(name):
+    code = bytes.fromhex(RUNTIMES[name])
+    insns = list(_instructions(code))
+    jumps = 0
+    for (_, opcode, imm), (_, next_op, _) in zip(insns, insns[1:]):
+        if opcode in (PUSH1, PUSH2) and next_op in (JUMP, JUMPI):
+            dest = int.from_bytes(imm, "big")
+            assert code[dest] == JUMPDEST, f"{name}: jump to {dest:#x}"
+            jumps += 1
+    assert jumps > 0
+
+
+def test_long_allowlist_jumps_past_byte_255():
+    code = bytes.fromhex(RUNTIMES["specialized_targets_long"])
+    assert len(code) > 256
+    insns = list(_instructions(code))
+    far = [
+        int.from_bytes(imm, "big")
+        for (_, opcode, imm), (_, next_op, _) in zip(insns, insns[1:])
+        if opcode == PUSH2 and next_op in (JUMP, JUMPI)
+    ]
+    assert any(dest > 0xff for dest in far)
+
+
+def test_specialized_bytecode_embeds_allowed_targets():
+    code = RUNTIMES["specialized_targets"]
+    assert USDC[2:].lower() in code
+    assert SWAP_ROUTER_02[2:].lower() in code
+
+
+@pytest.mark.parametrize("runtime_len", [0x20, 0x1ff])
+def test_init_code_copies_runtime_from_its_own_end(runtime_len):
+    runtime = bytes(range(256)) * 2
+    runtime_hex = runtime[:runtime_len].hex()
+    init = bytes.fromhex(_wrap_with_init_code(runtime_hex))
+    header_len = len(init) - runtime_len
+    # Second instruction is PUSH1 <offset of runtime inside the init code>
+    _, (_, opcode, imm), *_ = _instructions(init)
+    assert opcode == PUSH1
+    assert imm[0] == header_len
+    assert init[header_len:].hex() == runtime_hex
+
+
+def test_address_array_encoding_matches_eth_abi():
+    allowed = (USDC, SWAP_ROUTER_02)
+    expected = encode(["address", "address[]"], [USDC, list(allowed)])
+    assert _encode_address(USDC) + _encode_address_array(allowed) == expected
+
+
+@pytest.mark.parametrize("encoder,value", [
+    (_encode_address, "0x1234"),
+    (_encode_address, USDC + "00"),
+    (_encode_bytes4, "0x095ea7"),
+    (_encode_bytes4, APPROVE_SELECTOR + "00"),
+])
+def test_encoders_reject_wrong_length(encoder, value):
+    with pytest.raises(ValueError, match="bytes"):
+        encoder(value)
+
+
+@pytest.mark.parametrize("amount,cap", [(0, 0), (10_001 * 10**6, 10_000 * 10**6), (2**255, 2**64)])
+def test_value_limit_encoding_matches_eth_abi(amount, cap):
+    selector = Web3.keccak(text=VALUE_LIMIT_ENFORCE_SIG)[:4]
+    expected = selector + encode(["uint256", "uint256"], [amount, cap])
+    assert _encode_value_limit_call(amount, cap) == expected
+
+
+def test_bytes4_encoding_matches_eth_abi():
+    for sel in (APPROVE_SELECTOR, EXACT_INPUT_SINGLE_SELECTOR[2:]):
+        raw = bytes.fromhex(sel.removeprefix("0x"))
+        assert _encode_bytes4(sel) == encode(["bytes4"], [raw])
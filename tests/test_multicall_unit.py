@@ -0,0 +1,76 @@
+"""Unit tests for the Multicall3 reader (no EVM needed).
+
+These tests validate:
+  - aggregate3 calldata matches web3's ABI encoding
+  - return data is split per call, and a reverted call raises
+"""
+
+import pytest
+from eth_abi import encode
+from web3 import Web3
+
+from poc.constants import CHAINLINK_ETH_USD, POOL_USDC_WETH_030
+from poc.multicall import MULTICALL3, _encode_aggregate3, call_data, multicall_read
+
+from tests._web3compat import encode_abi
+
+AGGREGATE3_ABI = [{
+    "name": "aggregate3",
+    "type": "function",
+    "stateMutability": "payable",
+    "inputs": [{
+        "name": "calls",
+        "type": "tuple[]",
+        "components": [
+            {"name": "target", "type": "address"},
+            {"name": "allowFailure", "type": "bool"},
+            {"name": "callData", "type": "bytes"},
+        ],
+    }],
+    "outputs": [],
+}]
+
+CALLS = [
+    (POOL_USDC_WETH_030, call_data("slot0()")),
+    (CHAINLINK_ETH_USD, call_data("latestRoundData()")),
+]
+
+
+class _FakeEth:
+    def __init__(self, results):
+        self.results = results
+        self.requests = []
+
+    def call(self, tx):
+        self.requests.append(tx)
+        return encode(["(bool,bytes)[]"], [self.results])
+
+
+class _FakeW3:
+    def __init__(self, results):
+        self.eth = _FakeEth(results)
+
+
+def test_call_data_is_selector_plus_args():
+    assert call_data("slot0()") == Web3.keccak(text="slot0()")[:4]
+    args = encode(["address"], [MULTICALL3])
+    assert call_data("balanceOf(address)", args)[4:] == args
+
+
+def test_aggregate3_encoding_matches_web3():
+    contract = Web3().eth.contract(address=MULTICALL3, abi=AGGREGATE3_ABI)
+    expected = encode_abi(contract, "aggregate3", [[(t, True, d) for t, d in CALLS]])
+    assert "0x" + _encode_aggregate3(CALLS).hex() == expected
+
+
+def test_multicall_read_returns_data_per_call():
+    w3 = _FakeW3([(True, b"\x01" * 32), (True, b"\x02" * 64)])
+    assert multicall_read(w3, CALLS) == [b"\x01" * 32, b"\x02" * 64]
+    (tx,) = w3.eth.requests
+    assert tx["to"] == MULTICALL3
+
+
+def test_multicall_read_raises_on_reverted_call():
+    w3 = _FakeW3([(True, b""), (False, b"")])
+    with pytest.raises(RuntimeError, match=CHAINLINK_ETH_USD):
+        multicall_read(w3, CALLS)
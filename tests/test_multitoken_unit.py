@@ -9,6 +9,8 @@ These tests validate:
   - Violation scenarios across different token pairs
 """
 
+from functools import lru_cache
+
 import pytest
 from web3 import Web3
 
@@ -31,9 +33,19 @@ from poc.delegation import (
     validate_delegation,
 )
 
+from tests._selectors import TRANSFER_SELECTOR
+
 
 SENDER = "0x000000000000000000000000000000000000dEaD"
 
+# Registry entries bound once at import rather than looked up in each test
+USDC_TOK, WETH_TOK, DAI_TOK, USDT_TOK, WBTC_TOK = (
+    TOKENS[s] for s in ("USDC", "WETH", "DAI", "USDT", "WBTC")
+)
+USDC_WETH_PAIR, DAI_WETH_PAIR, USDT_WETH_PAIR, WBTC_WETH_PAIR = (
+    PAIRS[p] for p in ("USDC/WETH", "DAI/WETH", "USDT/WETH", "WBTC/WETH")
+)
+
 
 # ---------------------------------------------------------------------------
 # Token dataclass
@@ -47,7 +59,7 @@ class TestTokenDataclass:
         assert t.balance_slot == 5
 
     def test_token_is_frozen(self):
-        t = TOKENS["USDC"]
+        t = USDC_TOK
         with pytest.raises(AttributeError):
             t.symbol = "OTHER"
 
@@ -57,7 +69,7 @@ class TestTokenDataclass:
         assert t1 == t2
 
     def test_token_inequality(self):
-        assert TOKENS["USDC"] != TOKENS["WETH"]
+        assert USDC_TOK != WETH_TOK
 
 
 # ---------------------------------------------------------------------------
@@ -66,23 +78,33 @@ class TestTokenDataclass:
 
 class TestSwapPairDataclass:
     def test_create_pair(self):
-        pair = PAIRS["USDC/WETH"]
+        pair = USDC_WETH_PAIR
         assert pair.token_in.symbol == "USDC"
         assert pair.token_out.symbol == "WETH"
         assert pair.fee == 3000
 
     def test_pair_is_frozen(self):
-        pair = PAIRS["USDC/WETH"]
+        pair = USDC_WETH_PAIR
         with pytest.raises(AttributeError):
             pair.fee = 500
 
+    def test_pair_and_token_are_slotted(self):
+        pair = USDC_WETH_PAIR
+        assert not hasattr(pair, "__dict__")
+        assert not hasattr(pair.token_in, "__dict__")
+
+    @pytest.mark.parametrize("fee", [-1, 1 << 24])
+    def test_pair_rejects_fee_outside_uint24(self, fee):
+        with pytest.raises(ValueError, match="uint24"):
+            SwapPair(USDC_TOK, WETH_TOK, POOL_USDC_WETH_030, fee)
+
     def test_pair_pool_address_set(self):
-        pair = PAIRS["USDC/WETH"]
+        pair = USDC_WETH_PAIR
         assert pair.pool_address == POOL_USDC_WETH_030
 
     def test_pair_equality(self):
-        p1 = SwapPair(TOKENS["USDC"], TOKENS["WETH"], POOL_USDC_WETH_030, 3000)
-        p2 = SwapPair(TOKENS["USDC"], TOKENS["WETH"], POOL_USDC_WETH_030, 3000)
+        p1 = SwapPair(USDC_TOK, WETH_TOK, POOL_USDC_WETH_030, 3000)
+        p2 = SwapPair(USDC_TOK, WETH_TOK, POOL_USDC_WETH_030, 3000)
         assert p1 == p2
 
 
@@ -96,31 +118,31 @@ class TestTokenRegistry:
         assert set(TOKENS.keys()) == expected
 
     def test_usdc_metadata(self):
-        t = TOKENS["USDC"]
+        t = USDC_TOK
         assert t.address == USDC
         assert t.decimals == 6
         assert t.balance_slot == 9
 
     def test_weth_metadata(self):
-        t = TOKENS["WETH"]
+        t = WETH_TOK
         assert t.address == WETH
         assert t.decimals == 18
         assert t.balance_slot == 3
 
     def test_dai_metadata(self):
-        t = TOKENS["DAI"]
+        t = DAI_TOK
         assert t.address == DAI
         assert t.decimals == 18
         assert t.balance_slot == 2
 
     def test_usdt_metadata(self):
-        t = TOKENS["USDT"]
+        t = USDT_TOK
         assert t.address == USDT
         assert t.decimals == 6
         assert t.balance_slot == 2
 
     def test_wbtc_metadata(self):
-        t = TOKENS["WBTC"]
+        t = WBTC_TOK
         assert t.address == WBTC
         assert t.decimals == 8
         assert t.balance_slot == 0
@@ -154,6 +176,12 @@ class TestPairRegistry:
                 f"{name} pool {pair.pool_address} is not checksummed"
             )
 
+    def test_registries_are_read_only(self):
+        with pytest.raises(TypeError):
+            PAIRS["USDC/DAI"] = PAIRS["DAI/WETH"]
+        with pytest.raises(TypeError):
+            TOKENS["WETH"] = TOKENS["USDC"]
+
     def test_token_in_matches_first_symbol(self):
         for name, pair in PAIRS.items():
             first_symbol = name.split("/")[0]
@@ -166,7 +194,7 @@ class TestPairRegistry:
 
 class TestSwapCaveats:
     def test_returns_all_required_keys(self):
-        pair = PAIRS["USDC/WETH"]
+        pair = USDC_WETH_PAIR
         caveats = swap_caveats(pair, max_amount_in=1000, recipient=SENDER)
         assert set(caveats.keys()) == {
             "AllowedTargets",
@@ -176,27 +204,27 @@ class TestSwapCaveats:
         }
 
     def test_allowed_targets_has_token_in_and_router(self):
-        pair = PAIRS["DAI/WETH"]
+        pair = DAI_WETH_PAIR
         caveats = swap_caveats(pair, max_amount_in=1000, recipient=SENDER)
         assert DAI in caveats["AllowedTargets"]
         assert SWAP_ROUTER_02 in caveats["AllowedTargets"]
         assert len(caveats["AllowedTargets"]) == 2
 
     def test_allowed_methods_has_approve_and_swap(self):
-        pair = PAIRS["WBTC/WETH"]
+        pair = WBTC_WETH_PAIR
         caveats = swap_caveats(pair, max_amount_in=1000, recipient=SENDER)
         assert APPROVE_SELECTOR in caveats["AllowedMethods"]
         assert EXACT_INPUT_SINGLE_SELECTOR in caveats["AllowedMethods"]
 
     def test_erc20_transfer_amount_uses_token_in(self):
-        pair = PAIRS["USDT/WETH"]
+        pair = USDT_WETH_PAIR
         max_amount = 5_000 * 10**6
         caveats = swap_caveats(pair, max_amount_in=max_amount, recipient=SENDER)
         assert caveats["ERC20TransferAmount"]["token"] == USDT
         assert caveats["ERC20TransferAmount"]["maxAmount"] == max_amount
 
     def test_swap_constraints_use_pair_tokens(self):
-        pair = PAIRS["DAI/WETH"]
+        pair = DAI_WETH_PAIR
         caveats = swap_caveats(pair, max_amount_in=1000, recipient=SENDER)
         sc = caveats["SwapConstraints"]
         assert sc["tokenIn"] == DAI
@@ -225,7 +253,7 @@ class TestSwapCaveats:
 class TestBackwardsCompatibility:
     def test_swap_caveats_matches_usdc_weth_original(self):
         """swap_caveats() for USDC/WETH should produce identical output."""
-        pair = PAIRS["USDC/WETH"]
+        pair = USDC_WETH_PAIR
         max_usdc = 10_000 * 10**6
 
         generic = swap_caveats(pair, max_amount_in=max_usdc, recipient=SENDER)
@@ -246,28 +274,41 @@ class TestBackwardsCompatibility:
 
 DELEGATOR = "0x000000000000000000000000000000000000dEaD"
 DELEGATEE = "0x0000000000000000000000000000000000001234"
+ROUTER_INT = int(SWAP_ROUTER_02, 16)  # approve() spender argument
+APPROVE_SEL_BYTES = bytes.fromhex(APPROVE_SELECTOR.removeprefix("0x"))
+TRANSFER_SEL_BYTES = bytes.fromhex(TRANSFER_SELECTOR.removeprefix("0x"))
+
+
+@lru_cache(maxsize=None)
+def _pair_delegation(pair_name: str, max_amount_in: int) -> Delegation:
+    """DELEGATOR→DELEGATEE swap delegation for a registered pair, built once.
 
+    Delegations are frozen, so tests for the same (pair, cap) share one.
+    """
+    caveat_map = swap_caveats(
+        PAIRS[pair_name], max_amount_in=max_amount_in, recipient=DELEGATOR,
+    )
+    return delegation_from_caveat_map(DELEGATOR, DELEGATEE, caveat_map)
 
-def _build_calldata(selector: str, *uint256_args: int) -> bytes:
-    sel_hex = selector[2:] if selector.startswith("0x") else selector
-    data = bytes.fromhex(sel_hex)
-    for arg in uint256_args:
-        data += arg.to_bytes(32, "big")
-    return data
+
+@lru_cache(maxsize=256)
+def _build_calldata(selector: bytes, *uint256_args: int) -> bytes:
+    """Calldata for a raw 4-byte *selector* and uint256 args; the
+    parametrized tests repeat the same few, so each distinct one is
+    encoded once."""
+    return b"".join([selector, *[arg.to_bytes(32, "big") for arg in uint256_args]])
 
 
 class TestMultiTokenDelegationEnforcement:
     """Test that delegation enforcement works for non-USDC pairs."""
 
     def test_dai_delegation_valid_call(self):
-        pair = PAIRS["DAI/WETH"]
         max_dai = 10_000 * 10**18  # DAI has 18 decimals
-        caveat_map = swap_caveats(pair, max_amount_in=max_dai, recipient=DELEGATOR)
-        delegation = delegation_from_caveat_map(DELEGATOR, DELEGATEE, caveat_map)
+        delegation = _pair_delegation("DAI/WETH", max_dai)
 
         calldata = _build_calldata(
-            APPROVE_SELECTOR,
-            int(SWAP_ROUTER_02, 16),
+            APPROVE_SEL_BYTES,
+            ROUTER_INT,
             5_000 * 10**18,
         )
         # Should not raise
@@ -276,11 +317,9 @@ class TestMultiTokenDelegationEnforcement:
         )
 
     def test_dai_delegation_wrong_target(self):
-        pair = PAIRS["DAI/WETH"]
-        caveat_map = swap_caveats(pair, max_amount_in=1000, recipient=DELEGATOR)
-        delegation = delegation_from_caveat_map(DELEGATOR, DELEGATEE, caveat_map)
+        delegation = _pair_delegation("DAI/WETH", 1000)
 
-        calldata = _build_calldata(APPROVE_SELECTOR, 0, 100)
+        calldata = _build_calldata(APPROVE_SEL_BYTES, 0, 100)
         # USDC is NOT an allowed target for a DAI delegation
         with pytest.raises(EnforcementError, match="AllowedTargets"):
             validate_delegation(
@@ -288,15 +327,13 @@ class TestMultiTokenDelegationEnforcement:
             )
 
     def test_wbtc_delegation_over_cap(self):
-        pair = PAIRS["WBTC/WETH"]
         max_wbtc = 1 * 10**8  # 1 WBTC (8 decimals)
-        caveat_map = swap_caveats(pair, max_amount_in=max_wbtc, recipient=DELEGATOR)
-        delegation = delegation_from_caveat_map(DELEGATOR, DELEGATEE, caveat_map)
+        delegation = _pair_delegation("WBTC/WETH", max_wbtc)
 
         over_amount = 2 * 10**8  # 2 WBTC
         calldata = _build_calldata(
-            APPROVE_SELECTOR,
-            int(SWAP_ROUTER_02, 16),
+            APPROVE_SEL_BYTES,
+            ROUTER_INT,
             over_amount,
         )
         with pytest.raises(EnforcementError, match="ERC20TransferAmount"):
@@ -305,12 +342,9 @@ class TestMultiTokenDelegationEnforcement:
             )
 
     def test_usdt_delegation_wrong_method(self):
-        pair = PAIRS["USDT/WETH"]
-        caveat_map = swap_caveats(pair, max_amount_in=1000, recipient=DELEGATOR)
-        delegation = delegation_from_caveat_map(DELEGATOR, DELEGATEE, caveat_map)
+        delegation = _pair_delegation("USDT/WETH", 1000)
 
-        transfer_selector = Web3.keccak(text="transfer(address,uint256)")[:4].hex()
-        calldata = _build_calldata(transfer_selector, 0, 100)
+        calldata = _build_calldata(TRANSFER_SEL_BYTES, 0, 100)
         with pytest.raises(EnforcementError, match="AllowedMethods"):
             validate_delegation(
                 delegation, caller=DELEGATEE, target=USDT, calldata=calldata,
@@ -319,11 +353,9 @@ class TestMultiTokenDelegationEnforcement:
     @pytest.mark.parametrize("pair_name", list(PAIRS.keys()))
     def test_every_pair_enforces_target_whitelist(self, pair_name):
         """For every pair, calling an unrelated address should be rejected."""
-        pair = PAIRS[pair_name]
-        caveat_map = swap_caveats(pair, max_amount_in=1000, recipient=DELEGATOR)
-        delegation = delegation_from_caveat_map(DELEGATOR, DELEGATEE, caveat_map)
+        delegation = _pair_delegation(pair_name, 1000)
 
-        calldata = _build_calldata(APPROVE_SELECTOR, 0, 100)
+        calldata = _build_calldata(APPROVE_SEL_BYTES, 0, 100)
         random_target = "0x0000000000000000000000000000000000099999"
         with pytest.raises(EnforcementError, match="AllowedTargets"):
             validate_delegation(
@@ -333,15 +365,13 @@ class TestMultiTokenDelegationEnforcement:
     @pytest.mark.parametrize("pair_name", list(PAIRS.keys()))
     def test_every_pair_enforces_method_whitelist(self, pair_name):
         """For every pair, calling a disallowed method should be rejected."""
-        pair = PAIRS[pair_name]
-        caveat_map = swap_caveats(pair, max_amount_in=1000, recipient=DELEGATOR)
-        delegation = delegation_from_caveat_map(DELEGATOR, DELEGATEE, caveat_map)
+        delegation = _pair_delegation(pair_name, 1000)
 
-        calldata = _build_calldata("0xdeadbeef", 0, 100)
+        calldata = _build_calldata(b"\xde\xad\xbe\xef", 0, 100)
         with pytest.raises(EnforcementError, match="AllowedMethods"):
             validate_delegation(
                 delegation,
                 caller=DELEGATEE,
-                target=pair.token_in.address,
+                target=PAIRS[pair_name].token_in.address,
                 calldata=calldata,
             )
@@ -0,0 +1,71 @@
+"""Unit tests for the price math in poc/price.py (no EVM needed).
+
+These tests validate:
+  - sqrtPriceX96 <-> ETH/USD conversion round-trips, in exact integer math
+  - the closed-form swap size reaches the target in a single liquidity range
+"""
+
+import pytest
+
+from poc.constants import POOL_FEE
+from poc.price import (
+    _amount_in_to_reach,
+    _pool_eth_price,
+    _target_sqrt_price_x96,
+)
+
+Q96 = 2**96
+# Roughly the USDC/WETH 0.3% pool around block 19_000_000
+LIQUIDITY = 2 * 10**18
+
+
+def _sqrt_after_token0_in(sqrt_p: int, liquidity: int, amount: int) -> int:
+    """Uniswap V3 getNextSqrtPriceFromAmount0RoundingUp."""
+    num = liquidity * Q96
+    return -(-num * sqrt_p // (num + amount * sqrt_p))
+
+
+def _sqrt_after_token1_in(sqrt_p: int, liquidity: int, amount: int) -> int:
+    """Uniswap V3 getNextSqrtPriceFromAmount1RoundingDown."""
+    return sqrt_p + amount * Q96 // liquidity
+
+
+def _net_of_fee(amount: int, fee: int) -> int:
+    return amount * (1_000_000 - fee) // 1_000_000
+
+
+@pytest.mark.parametrize("eth_usd", [1_000.0, 2_400.0, 2_600.0])
+def test_target_sqrt_price_round_trips(eth_usd):
+    assert _pool_eth_price(_target_sqrt_price_x96(eth_usd)) == pytest.approx(eth_usd)
+
+
+@pytest.mark.parametrize("eth_usd", [2_400.0, 0.000001, 1e9])
+def test_target_sqrt_price_is_floor_integer_sqrt(eth_usd):
+    """Exact integer sqrt of 1e12 / price * 2**192, at any magnitude."""
+    radicand = 10**18 * 2**192 // round(eth_usd * 1e6)
+    root = _target_sqrt_price_x96(eth_usd)
+    assert root * root <= radicand < (root + 1) ** 2
+
+
+@pytest.mark.parametrize("start,target", [(2_400.0, 2_600.0), (2_400.0, 2_401.0)])
+def test_amount_in_reaches_higher_eth_price(start, target):
+    """Selling USDC (token0) lowers sqrtP and raises the ETH price."""
+    sqrt_p = _target_sqrt_price_x96(start)
+    target_sqrt = _target_sqrt_price_x96(target)
+    amount = _amount_in_to_reach(sqrt_p, target_sqrt, LIQUIDITY, POOL_FEE)
+    after = _sqrt_after_token0_in(sqrt_p, LIQUIDITY, _net_of_fee(amount, POOL_FEE))
+    assert after <= target_sqrt
+    # ...and only just: slightly less would fall short
+    short = _sqrt_after_token0_in(sqrt_p, LIQUIDITY, _net_of_fee(amount - 10, POOL_FEE))
+    assert short > target_sqrt
+
+
+@pytest.mark.parametrize("start,target", [(2_600.0, 2_400.0), (2_400.0, 2_399.0)])
+def test_amount_in_reaches_lower_eth_price(start, target):
+    """Selling WETH (token1) raises sqrtP and lowers the ETH price."""
+    sqrt_p = _target_sqrt_price_x96(start)
+    target_sqrt = _target_sqrt_price_x96(target)
+    amount = _amount_in_to_reach(sqrt_p, target_sqrt, LIQUIDITY, POOL_FEE)
+    after = _sqrt_after_token1_in(sqrt_p, LIQUIDITY, _net_of_fee(amount, POOL_FEE))
+    assert after >= target_sqrt
+    assert amount < 10**24  # sane order of magnitude for WETH wei